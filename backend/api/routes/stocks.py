@@ -90,7 +90,7 @@ class ComprehensiveStockSearchService:
                         WHEN s.company_name LIKE ? THEN 4
                         ELSE 5
                     END as rank
-                FROM stock_symbols s
+                FROM stock_symbols_v s
                 LEFT JOIN symbol_metadata sm ON s.symbol = sm.symbol
                 WHERE {where_clause}
                 ORDER BY rank ASC, s.market_cap DESC NULLS LAST, s.symbol ASC
@@ -152,7 +152,7 @@ class ComprehensiveStockSearchService:
                 SELECT 
                     symbol, company_name, exchange, segment, sector, 
                     market_cap, is_fo_enabled, is_etf, is_index
-                FROM stock_symbols 
+                FROM stock_symbols_v 
                 WHERE {where_condition}
                 ORDER BY market_cap DESC NULLS LAST
                 LIMIT ?
@@ -191,7 +191,7 @@ class ComprehensiveStockSearchService:
             cursor = conn.cursor()
             
             cursor.execute("""
-                SELECT * FROM stock_symbols 
+                SELECT * FROM stock_symbols_v 
                 WHERE symbol = ? AND exchange = ? AND status = 'ACTIVE'
             """, (symbol, exchange))
             
@@ -247,7 +247,7 @@ class ComprehensiveStockSearchService:
                     sm.shares_outstanding,
                     sm.float_shares,
                     sm.avg_volume
-                FROM stock_symbols s
+                FROM stock_symbols_v s
                 LEFT JOIN symbol_metadata sm ON s.symbol = sm.symbol
                 WHERE {where_condition} AND s.status = 'ACTIVE'
                 LIMIT 1
@@ -481,13 +481,13 @@ async def get_database_stats():
         cursor = conn.cursor()
         
         # Total symbols
-        cursor.execute("SELECT COUNT(*) FROM stock_symbols WHERE status = 'ACTIVE'")
+        cursor.execute("SELECT COUNT(*) FROM stock_symbols_v WHERE status = 'ACTIVE'")
         total = cursor.fetchone()[0]
         
         # By exchange
         cursor.execute("""
             SELECT exchange, COUNT(*) as count 
-            FROM stock_symbols 
+            FROM stock_symbols_v 
             WHERE status = 'ACTIVE' 
             GROUP BY exchange 
             ORDER BY count DESC
@@ -497,7 +497,7 @@ async def get_database_stats():
         # By segment
         cursor.execute("""
             SELECT segment, COUNT(*) as count 
-            FROM stock_symbols 
+            FROM stock_symbols_v 
             WHERE status = 'ACTIVE' 
             GROUP BY segment 
             ORDER BY count DESC
@@ -505,7 +505,7 @@ async def get_database_stats():
         by_segment = [{"segment": row[0], "count": row[1]} for row in cursor.fetchall()]
         
         # F&O count
-        cursor.execute("SELECT COUNT(*) FROM stock_symbols WHERE is_fo_enabled = 1 AND status = 'ACTIVE'")
+        cursor.execute("SELECT COUNT(*) FROM stock_symbols_v WHERE is_fo_enabled = 1 AND status = 'ACTIVE'")
         fo_count = cursor.fetchone()[0]
         
         conn.close()
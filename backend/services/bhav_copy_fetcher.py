@@ -120,37 +120,45 @@ class BhavCopyFetcher:
             target_date -= timedelta(days=1)
         return target_date
     
-    async def download_nse_bhav_copy(self, trade_date: date) -> Optional[Path]:
-        """Download NSE bhav copy for given date"""
+    async def download_nse_bhav_copy(self, trade_date: date, session: Optional[aiohttp.ClientSession] = None) -> Optional[Path]:
+        """Download NSE bhav copy for given date
+
+        Pass a shared ClientSession when downloading many dates so the
+        connection pool (and TLS handshakes) are reused across requests;
+        without one a throwaway session is created per call as before.
+        """
         try:
             # Format date for NSE (ddMMyyyy)
             date_str = trade_date.strftime("%d%m%Y")
-            
+
             # Try multiple URL formats as NSE changes formats occasionally
             urls_to_try = [
                 f"https://nsearchives.nseindia.com/products/content/sec_bhavdata_full_{date_str}.csv",
                 f"https://nsearchives.nseindia.com/content/historical/EQUITIES/{trade_date.year}/{trade_date.strftime('%b').upper()}/cm{date_str}bhav.csv.zip",
                 f"https://www1.nseindia.com/content/historical/EQUITIES/{trade_date.year}/{trade_date.strftime('%b').upper()}/cm{date_str}bhav.csv.zip"
             ]
-            
-            async with aiohttp.ClientSession(headers=self.headers) as session:
+
+            owned_session = session is None
+            if owned_session:
+                session = aiohttp.ClientSession(headers=self.headers)
+            try:
                 for url in urls_to_try:
                     try:
                         logger.info(f"Trying NSE URL: {url}")
                         async with session.get(url) as response:
                             if response.status == 200:
                                 content = await response.read()
-                                
+
                                 # Save file
                                 filename = f"nse_bhav_{date_str}.csv"
                                 if url.endswith('.zip'):
                                     filename = f"nse_bhav_{date_str}.zip"
-                                
+
                                 file_path = self.data_dir / filename
-                                
+
                                 with open(file_path, 'wb') as f:
                                     f.write(content)
-                                
+
                                 # Extract if zip file
                                 if filename.endswith('.zip'):
                                     csv_path = self.extract_zip_file(file_path, f"nse_bhav_{date_str}.csv")
@@ -158,49 +166,59 @@ class BhavCopyFetcher:
                                         return csv_path
                                 else:
                                     return file_path
-                                    
+
                     except Exception as e:
                         logger.warning(f"Failed to download from {url}: {e}")
                         continue
-            
+            finally:
+                if owned_session:
+                    await session.close()
+
             logger.error(f"Failed to download NSE bhav copy for {trade_date}")
             return None
-            
+
         except Exception as e:
             logger.error(f"Error downloading NSE bhav copy: {e}")
             return None
-    
-    async def download_bse_bhav_copy(self, trade_date: date) -> Optional[Path]:
-        """Download BSE bhav copy for given date"""
+
+    async def download_bse_bhav_copy(self, trade_date: date, session: Optional[aiohttp.ClientSession] = None) -> Optional[Path]:
+        """Download BSE bhav copy for given date
+
+        Accepts an optional shared ClientSession; see download_nse_bhav_copy.
+        """
         try:
             # Format date for BSE (ddmmyy)
             date_str = trade_date.strftime("%d%m%y")
-            
+
             url = f"https://www.bseindia.com/download/BhavCopy/Equity/EQ{date_str}_CSV.ZIP"
-            
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                try:
-                    logger.info(f"Downloading BSE bhav copy from: {url}")
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            content = await response.read()
-                            
-                            # Save zip file
-                            zip_path = self.data_dir / f"bse_bhav_{date_str}.zip"
-                            with open(zip_path, 'wb') as f:
-                                f.write(content)
-                            
-                            # Extract CSV
-                            csv_path = self.extract_zip_file(zip_path, f"bse_bhav_{date_str}.csv")
-                            return csv_path
-                        else:
-                            logger.error(f"BSE download failed with status: {response.status}")
-                            return None
-                            
-                except Exception as e:
-                    logger.error(f"Error downloading BSE bhav copy: {e}")
-                    return None
-            
+
+            owned_session = session is None
+            if owned_session:
+                session = aiohttp.ClientSession(headers=self.headers)
+            try:
+                logger.info(f"Downloading BSE bhav copy from: {url}")
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        content = await response.read()
+
+                        # Save zip file
+                        zip_path = self.data_dir / f"bse_bhav_{date_str}.zip"
+                        with open(zip_path, 'wb') as f:
+                            f.write(content)
+
+                        # Extract CSV
+                        csv_path = self.extract_zip_file(zip_path, f"bse_bhav_{date_str}.csv")
+                        return csv_path
+                    else:
+                        logger.error(f"BSE download failed with status: {response.status}")
+                        return None
+            except Exception as e:
+                logger.error(f"Error downloading BSE bhav copy: {e}")
+                return None
+            finally:
+                if owned_session:
+                    await session.close()
+
         except Exception as e:
             logger.error(f"Error in BSE bhav copy download: {e}")
             return None
@@ -379,54 +397,61 @@ class BhavCopyFetcher:
         if not data_points:
             return 0
             
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        # Batched write: one transaction (and one fsync) per day's file
+        # instead of autocommit row by row. The generous timeout lets
+        # concurrent per-date tasks queue for SQLite's single writer.
+        conn = sqlite3.connect(self.db_path, timeout=30)
+
         try:
-            stored_count = 0
-            for point in data_points:
-                try:
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO bhav_data (
-                            id, symbol, exchange, date, series, open, high, low, close,
-                            last, prev_close, total_traded_qty, total_traded_value, 
-                            isin, source
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        f"{point.symbol}_{point.exchange}_{point.date}_{point.series}",
-                        point.symbol,
-                        point.exchange,
-                        point.date,
-                        point.series,
-                        point.open,
-                        point.high,
-                        point.low,
-                        point.close,
-                        point.last,
-                        point.prev_close,
-                        point.total_traded_qty,
-                        point.total_traded_value,
-                        point.isin,
-                        point.source
-                    ))
-                    stored_count += 1
-                except sqlite3.IntegrityError:
-                    # Data already exists
-                    continue
-            
-            conn.commit()
+            rows = [
+                (
+                    f"{point.symbol}_{point.exchange}_{point.date}_{point.series}",
+                    point.symbol,
+                    point.exchange,
+                    point.date,
+                    point.series,
+                    point.open,
+                    point.high,
+                    point.low,
+                    point.close,
+                    point.last,
+                    point.prev_close,
+                    point.total_traded_qty,
+                    point.total_traded_value,
+                    point.isin,
+                    point.source
+                )
+                for point in data_points
+            ]
+
+            with conn:
+                cursor = conn.cursor()
+                cursor.executemany("""
+                    INSERT OR REPLACE INTO bhav_data (
+                        id, symbol, exchange, date, series, open, high, low, close,
+                        last, prev_close, total_traded_qty, total_traded_value,
+                        isin, source
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                stored_count = cursor.rowcount
+
             logger.info(f"Stored {stored_count} bhav data points")
             return stored_count
-            
+
         except Exception as e:
             logger.error(f"Error storing bhav data: {e}")
-            conn.rollback()
             return 0
         finally:
             conn.close()
     
-    async def download_bhav_data(self, trade_date: Optional[date] = None) -> Dict[str, Any]:
-        """Download and process bhav copy data for a specific date"""
+    async def download_bhav_data(self, trade_date: Optional[date] = None, session: Optional[aiohttp.ClientSession] = None,
+                                 ensure_table: bool = True) -> Dict[str, Any]:
+        """Download and process bhav copy data for a specific date
+
+        The historical iterator passes ensure_table=False after doing the
+        schema check once for the whole range; standalone callers keep the
+        default and stay self-contained.
+        """
         if trade_date is None:
             trade_date = self.get_trading_date(date.today() - timedelta(days=1))
         
@@ -440,12 +465,13 @@ class BhavCopyFetcher:
             "errors": []
         }
         
-        # Setup database
-        self.setup_bhav_data_table()
+        # Setup database (skipped when the caller already did it)
+        if ensure_table:
+            self.setup_bhav_data_table()
         
         # Download NSE data
         try:
-            nse_file = await self.download_nse_bhav_copy(trade_date)
+            nse_file = await self.download_nse_bhav_copy(trade_date, session=session)
             if nse_file and nse_file.exists():
                 nse_data = self.parse_nse_bhav_csv(nse_file, trade_date)
                 if nse_data:
@@ -468,7 +494,7 @@ class BhavCopyFetcher:
         
         # Download BSE data
         try:
-            bse_file = await self.download_bse_bhav_copy(trade_date)
+            bse_file = await self.download_bse_bhav_copy(trade_date, session=session)
             if bse_file and bse_file.exists():
                 bse_data = self.parse_bse_bhav_csv(bse_file, trade_date)
                 if bse_data:
@@ -499,14 +525,78 @@ class BhavCopyFetcher:
         
         return results
     
-    async def download_historical_bhav_data(self, start_date: date, end_date: Optional[date] = None) -> Dict[str, Any]:
-        """Download historical bhav data for a date range"""
+    async def iter_historical_bhav_data(self, start_date: date, end_date: Optional[date] = None,
+                                        session: Optional[aiohttp.ClientSession] = None):
+        """Yield per-day download results as each date completes
+
+        Dates are fetched concurrently over a shared connection pool
+        instead of one sequential request per day, so a yearly backfill
+        is bounded by bandwidth rather than ~250 round-trip latencies.
+        A semaphore caps in-flight downloads so the exchange servers are
+        not overwhelmed (this replaces the old 2s sleep between dates).
+
+        Each day's records are committed to SQLite before its stats dict
+        is yielded, so callers folding running counters hold one day of
+        results at a time no matter how wide the date range is.
+        """
         if end_date is None:
             end_date = self.get_trading_date(date.today() - timedelta(days=1))
-        
-        logger.info(f"🚀 Starting historical bhav download: {start_date} to {end_date}")
-        
+
+        # Collect trading dates up front (weekends excluded)
+        trading_dates = []
         current_date = start_date
+        while current_date <= end_date:
+            if current_date.weekday() < 5:  # Monday = 0, Friday = 4
+                trading_dates.append(current_date)
+            current_date += timedelta(days=1)
+
+        # One schema check up front instead of one per concurrent task
+        self.setup_bhav_data_table()
+
+        semaphore = asyncio.Semaphore(20)
+
+        async def _sem_fetch(sess: aiohttp.ClientSession, trade_date: date) -> Dict[str, Any]:
+            async with semaphore:
+                logger.info(f"📅 Processing {trade_date}")
+                try:
+                    return await self.download_bhav_data(trade_date, session=sess, ensure_table=False)
+                except Exception as e:
+                    logger.error(f"{trade_date}: {e}")
+                    return {
+                        "date": trade_date.strftime('%Y-%m-%d'),
+                        "nse": {"success": False, "records": 0, "file": None},
+                        "bse": {"success": False, "records": 0, "file": None},
+                        "total_records": 0,
+                        "errors": [str(e)]
+                    }
+
+        async def _iter_with(sess: aiohttp.ClientSession):
+            tasks = [asyncio.ensure_future(_sem_fetch(sess, d)) for d in trading_dates]
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+
+        if session is not None:
+            async for result in _iter_with(session):
+                yield result
+        else:
+            connector = aiohttp.TCPConnector(limit=50, limit_per_host=10, ttl_dns_cache=300)
+            async with aiohttp.ClientSession(connector=connector, headers=self.headers) as owned_session:
+                async for result in _iter_with(owned_session):
+                    yield result
+
+    async def download_historical_bhav_data(self, start_date: date, end_date: Optional[date] = None,
+                                            session: Optional[aiohttp.ClientSession] = None) -> Dict[str, Any]:
+        """Download historical bhav data for a date range
+
+        Thin aggregation over iter_historical_bhav_data: folds each day's
+        stats into running counters as it arrives, so peak memory stays at
+        one day's result regardless of the window size.
+        """
+        if end_date is None:
+            end_date = self.get_trading_date(date.today() - timedelta(days=1))
+
+        logger.info(f"🚀 Starting historical bhav download: {start_date} to {end_date}")
+
         total_stats = {
             "start_date": start_date.strftime('%Y-%m-%d'),
             "end_date": end_date.strftime('%Y-%m-%d'),
@@ -517,35 +607,19 @@ class BhavCopyFetcher:
             "bse_records": 0,
             "errors": []
         }
-        
-        while current_date <= end_date:
-            # Skip weekends
-            if current_date.weekday() < 5:  # Monday = 0, Friday = 4
-                try:
-                    logger.info(f"📅 Processing {current_date}")
-                    total_stats["total_days"] += 1
-                    
-                    result = await self.download_bhav_data(current_date)
-                    
-                    if result["total_records"] > 0:
-                        total_stats["successful_days"] += 1
-                        total_stats["total_records"] += result["total_records"]
-                        total_stats["nse_records"] += result["nse"]["records"]
-                        total_stats["bse_records"] += result["bse"]["records"]
-                    
-                    if result["errors"]:
-                        total_stats["errors"].extend([f"{current_date}: {err}" for err in result["errors"]])
-                    
-                    # Rate limiting between requests
-                    await asyncio.sleep(2)
-                    
-                except Exception as e:
-                    error_msg = f"{current_date}: {str(e)}"
-                    total_stats["errors"].append(error_msg)
-                    logger.error(error_msg)
-            
-            current_date += timedelta(days=1)
-        
+
+        async for result in self.iter_historical_bhav_data(start_date, end_date, session=session):
+            total_stats["total_days"] += 1
+
+            if result["total_records"] > 0:
+                total_stats["successful_days"] += 1
+                total_stats["total_records"] += result["total_records"]
+                total_stats["nse_records"] += result["nse"]["records"]
+                total_stats["bse_records"] += result["bse"]["records"]
+
+            if result["errors"]:
+                total_stats["errors"].extend([f"{result['date']}: {err}" for err in result["errors"]])
+
         logger.info(f"✅ Historical download completed!")
         logger.info(f"📊 Stats: {total_stats['successful_days']}/{total_stats['total_days']} days successful")
         logger.info(f"📈 Total records: {total_stats['total_records']} (NSE: {total_stats['nse_records']}, BSE: {total_stats['bse_records']})")
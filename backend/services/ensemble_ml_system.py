@@ -756,7 +756,7 @@ class EnsembleMLSystem:
             
             cursor.execute("""
                 SELECT DISTINCT symbol, exchange 
-                FROM stock_symbols 
+                FROM stock_symbols_v 
                 WHERE status = 'ACTIVE' AND is_fo_enabled = 1
                 ORDER BY market_cap DESC NULLS LAST
                 LIMIT 50
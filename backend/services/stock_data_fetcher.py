@@ -3,6 +3,7 @@ import httpx
 import asyncio
 import logging
 from typing import List, Dict, Optional
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from ..models.market_data import StockSymbol
 # Note: get_db import removed to avoid async engine issues
@@ -185,18 +186,19 @@ class StockDataFetcher:
             
             # Clear existing data
             db.query(StockSymbol).delete()
-            
-            # Insert new data
-            inserted_count = 0
-            for stock_data in all_stocks:
-                try:
-                    stock = StockSymbol(**stock_data)
-                    db.add(stock)
-                    inserted_count += 1
-                except Exception as e:
-                    logger.error(f"Error inserting stock {stock_data.get('symbol', 'Unknown')}: {e}")
-                    continue
-            
+
+            # Insert through Core as one executemany: per-object db.add
+            # pays identity-map and attribute-event bookkeeping per row.
+            # Unknown keys are filtered out up front (the old per-row
+            # constructor try/except did the same job one object at a time)
+            columns = {c.key for c in StockSymbol.__table__.columns}
+            rows = [
+                {k: v for k, v in stock_data.items() if k in columns}
+                for stock_data in all_stocks
+            ]
+            db.execute(insert(StockSymbol), rows)
+            inserted_count = len(rows)
+
             db.commit()
             logger.info(f"Successfully populated database with {inserted_count} stock symbols")
             return inserted_count
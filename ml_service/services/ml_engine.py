@@ -1,6 +1,8 @@
 import asyncio
 import logging
+import httpx
 import numpy as np
+import orjson
 import pandas as pd
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
@@ -76,7 +78,16 @@ class MLModel:
         self.is_trained = False
         self.version = "1.0"
         self.performance_metrics = {}
-        
+        # Reusable inference buffers (allocated once in train/load_model)
+        self._in_buf: Optional[np.ndarray] = None
+        self._seq_buf: Optional[np.ndarray] = None
+
+    def _ensure_buffers(self, n_features: int):
+        """Preallocate reusable buffers for the predict hot path"""
+        if self._in_buf is None or self._in_buf.shape[1] != n_features:
+            self._in_buf = np.empty((1, n_features), dtype=np.float32)
+            self._seq_buf = np.zeros((1, 60, n_features), dtype=np.float32)
+
     def prepare_features(self, data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
         """Prepare features for training/prediction"""
         # Technical indicators
@@ -136,9 +147,91 @@ class MLModel:
         X = data[feature_cols].values
         y_price = data['target'].values
         y_direction = data['target_direction'].values
-        
+
         return X, y_price, y_direction
-    
+
+    def prepare_features_arrays(
+        self,
+        open_: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray
+    ) -> np.ndarray:
+        """Compute the latest feature vector directly from OHLCV arrays
+
+        Works on plain ndarrays so the prediction path avoids DataFrame
+        construction. Individual indicators match prepare_features, but the
+        row differs deliberately: prepare_features computes a next-bar
+        target and dropna()s it away, so its final surviving row is the
+        second-to-last bar. This path predicts from the most recent bar —
+        the target column does not exist at inference time, so there is
+        nothing to drop and no reason to discard the freshest data.
+        """
+        n = close.shape[0]
+        if n < 22:
+            raise ValueError("Insufficient history for feature computation (need at least 22 periods)")
+
+        def ewm_series(values: np.ndarray, span: int) -> np.ndarray:
+            # Matches pandas ewm(span=span, adjust=True).mean()
+            alpha = 2.0 / (span + 1.0)
+            decay = 1.0 - alpha
+            out = np.empty(values.shape[0], dtype=np.float64)
+            num = 0.0
+            den = 0.0
+            for i in range(values.shape[0]):
+                num = values[i] + decay * num
+                den = 1.0 + decay * den
+                out[i] = num / den
+            return out
+
+        close64 = close.astype(np.float64, copy=False)
+        volume64 = volume.astype(np.float64, copy=False)
+
+        # Moving averages
+        sma_5 = close64[-5:].mean()
+        sma_20 = close64[-20:].mean()
+        ema_12 = ewm_series(close64, 12)
+        ema_26 = ewm_series(close64, 26)
+
+        # MACD
+        macd = ema_12 - ema_26
+        macd_signal = ewm_series(macd, 9)
+        macd_histogram = macd[-1] - macd_signal[-1]
+
+        # RSI
+        delta = np.diff(close64)
+        gain = np.where(delta > 0, delta, 0.0)[-14:].mean()
+        loss = np.where(delta < 0, -delta, 0.0)[-14:].mean()
+        rsi = 100.0 if loss == 0 else 100.0 - (100.0 / (1.0 + gain / loss))
+
+        # Bollinger Bands
+        bb_window = close64[-20:]
+        bb_middle = bb_window.mean()
+        bb_std = bb_window.std(ddof=1)
+        bb_upper = bb_middle + (bb_std * 2)
+        bb_lower = bb_middle - (bb_std * 2)
+        bb_position = (close64[-1] - bb_lower) / (bb_upper - bb_lower)
+
+        # Volume indicators
+        volume_ratio = volume64[-1] / volume64[-10:].mean()
+
+        # Price changes
+        price_change_1d = close64[-1] / close64[-2] - 1
+        price_change_5d = close64[-1] / close64[-6] - 1
+
+        # Volatility
+        returns = delta / close64[:-1]
+        volatility = returns[-20:].std(ddof=1)
+
+        return np.array([
+            open_[-1], high[-1], low[-1], close64[-1], volume64[-1],
+            sma_5, sma_20, ema_12[-1], ema_26[-1],
+            macd[-1], macd_signal[-1], macd_histogram,
+            rsi, bb_position, volume_ratio,
+            price_change_1d, price_change_5d, volatility
+        ], dtype=np.float32)
+
     def train(self, data: pd.DataFrame) -> Dict[str, float]:
         """Train the ML model"""
         try:
@@ -240,7 +333,8 @@ class MLModel:
                 'directional_accuracy': directional_accuracy,
                 'rmse': np.sqrt(mse)
             }
-            
+
+            self._ensure_buffers(X.shape[1])
             self.is_trained = True
             logger.info(f"Model trained successfully: {self.model_type.value} for {self.symbol}")
             
@@ -256,19 +350,21 @@ class MLModel:
             raise ValueError("Model not trained")
         
         try:
-            # Scale features
-            features_scaled = self.scaler.transform(features.reshape(1, -1))
-            
+            # Scale features via the preallocated input buffer
+            self._ensure_buffers(features.shape[0])
+            np.copyto(self._in_buf[0], features)
+            features_scaled = self.scaler.transform(self._in_buf)
+
             if self.model_type in [ModelType.LSTM, ModelType.GRU]:
                 # For sequence models, use the last 60 points
                 if len(features_scaled[0]) >= 60:
                     features_seq = features_scaled[0][-60:].reshape(1, 60, -1)
                     price_pred = self.model['price'].predict(features_seq)[0][0]
                 else:
-                    # If not enough data, pad with zeros
-                    padded = np.zeros((1, 60, features_scaled.shape[1]))
-                    padded[0, -len(features_scaled[0]):] = features_scaled[0]
-                    price_pred = self.model['price'].predict(padded)[0][0]
+                    # If not enough data, pad with zeros (reusable buffer)
+                    self._seq_buf.fill(0.0)
+                    self._seq_buf[0, -len(features_scaled[0]):] = features_scaled[0]
+                    price_pred = self.model['price'].predict(self._seq_buf)[0][0]
                 
                 direction_pred = "up" if price_pred > 0 else "down"
                 confidence = min(abs(price_pred) * 10, 1.0)  # Simple confidence calculation
@@ -338,13 +434,17 @@ class MLModel:
             
             # Load scaler
             self.scaler = joblib.load(model_path / "scaler.pkl")
-            
+            n_features = getattr(self.scaler, 'n_features_in_', None)
+            if n_features:
+                self._ensure_buffers(int(n_features))
+
             # Load model
             if self.model_type in [ModelType.LSTM, ModelType.GRU]:
                 price_model = keras_load_model(model_path / "price_model.h5")
                 self.model = {'price': price_model, 'direction': None}
             else:
-                self.model = joblib.load(model_path / "model.pkl")
+                # mmap large arrays so versions sharing weights share pages
+                self.model = joblib.load(model_path / "model.pkl", mmap_mode='r')
             
             logger.info(f"Model loaded from {path}")
             
@@ -355,20 +455,35 @@ class MLModel:
 class MLEngine:
     def __init__(self):
         self.models: Dict[str, MLModel] = {}
+        # Best model per (symbol, timeframe), refreshed on train/load so
+        # predict does a single dict lookup instead of scanning ModelType
+        self._best_per_key: Dict[Tuple[str, str], MLModel] = {}
         # Get project root directory
         current_file = Path(__file__)
         project_root = current_file.parent.parent.parent
         self.model_dir = project_root / "models"
         self.model_dir.mkdir(exist_ok=True)
-        
+        self._http: Optional[httpx.AsyncClient] = None
+
     async def initialize(self):
         """Initialize the ML engine"""
         logger.info("Initializing ML Engine")
+        # Shared client with keepalive + HTTP/2 so predictions don't pay
+        # a TCP/TLS handshake to the data service on every call
+        self._http = httpx.AsyncClient(
+            base_url="http://localhost:8002",
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=httpx.Timeout(10.0)
+        )
         await self.load_models()
-        
+
     async def shutdown(self):
         """Shutdown the ML engine"""
         logger.info("Shutting down ML Engine")
+        if self._http:
+            await self._http.aclose()
+            self._http = None
         
     async def load_models(self):
         """Load existing models from disk"""
@@ -381,7 +496,8 @@ class MLEngine:
                         
                         model_key = f"{model.symbol}_{model.timeframe.value}_{model.model_type.value}"
                         self.models[model_key] = model
-                        
+                        self._refresh_best(model.symbol, model.timeframe.value)
+
                         logger.info(f"Loaded model: {model_key}")
                         
                     except Exception as e:
@@ -409,7 +525,8 @@ class MLEngine:
             
             # Store in memory
             self.models[model_key] = model
-            
+            self._refresh_best(symbol, timeframe.value)
+
             logger.info(f"Model trained and saved: {model_key}")
             
             return ModelPerformance(
@@ -428,65 +545,90 @@ class MLEngine:
             logger.error(f"Failed to train model: {str(e)}")
             raise
     
+    def register_model(self, model_key: str, model: MLModel):
+        """Insert (or replace) a model and keep the best-model index coherent
+
+        External loaders (the deployment service) go through here instead
+        of mutating self.models directly, so predict's precomputed lookup
+        never misses a model that is actually resident.
+        """
+        self.models[model_key] = model
+        self._refresh_best(model.symbol, model.timeframe.value)
+
+    def unregister_model(self, model_key: str):
+        """Remove a model and drop any best-model index reference to it"""
+        model = self.models.pop(model_key, None)
+        if model is not None:
+            self._refresh_best(model.symbol, model.timeframe.value)
+
+    def _refresh_best(self, symbol: str, timeframe_value: str):
+        """Recompute the best model for a (symbol, timeframe) pair"""
+        best_model = None
+        best_performance = 0
+
+        for model_type in ModelType:
+            model = self.models.get(f"{symbol}_{timeframe_value}_{model_type.value}")
+            if model:
+                accuracy = model.performance_metrics.get('directional_accuracy', 0)
+                if accuracy > best_performance:
+                    best_model = model
+                    best_performance = accuracy
+
+        if best_model:
+            self._best_per_key[(symbol, timeframe_value)] = best_model
+        else:
+            self._best_per_key.pop((symbol, timeframe_value), None)
+
     async def predict(self, request: PredictionRequest) -> PredictionResult:
         """Generate prediction"""
         try:
-            # Find best model for symbol and timeframe
-            model_candidates = [
-                f"{request.symbol}_{request.timeframe.value}_{model_type.value}"
-                for model_type in ModelType
-            ]
-            
-            best_model = None
-            best_performance = 0
-            
-            for model_key in model_candidates:
-                if model_key in self.models:
-                    model = self.models[model_key]
-                    accuracy = model.performance_metrics.get('directional_accuracy', 0)
-                    if accuracy > best_performance:
-                        best_model = model
-                        best_performance = accuracy
-            
+            # Find best model for symbol and timeframe (precomputed index)
+            best_model = self._best_per_key.get((request.symbol, request.timeframe.value))
+
             if not best_model:
                 raise ValueError(f"No trained model found for {request.symbol} {request.timeframe.value}")
             
-            # Get current market data from data service
-            import httpx
-            async with httpx.AsyncClient() as client:
-                try:
-                    # Get real-time price from data service
-                    price_response = await client.get(
-                        f"http://localhost:8002/v1/market-data/{request.symbol}/current",
-                        timeout=10.0
-                    )
-                    if price_response.status_code == 200:
-                        price_data = price_response.json()
-                        current_price = price_data['current_price']
-                    else:
-                        raise ValueError(f"Failed to get current price: {price_response.status_code}")
-                    
-                    # Get historical data for feature engineering
-                    history_response = await client.get(
-                        f"http://localhost:8002/v1/market-data/{request.symbol}/history",
-                        params={"period": "1mo", "interval": "1d"},
-                        timeout=15.0
-                    )
-                    if history_response.status_code == 200:
-                        history_data = history_response.json()
-                        df = pd.DataFrame(history_data['data'])
-                        
-                        # Prepare latest features from real data
-                        X, _, _ = best_model.prepare_features(df)
-                        features = X[-1]  # Use latest feature vector
-                    else:
-                        raise ValueError(f"Failed to get historical data: {history_response.status_code}")
-                        
-                except Exception as e:
-                    logger.error(f"Failed to get real market data: {e}")
-                    # Fallback to last known data or raise error
-                    raise ValueError(f"Unable to get market data for prediction: {e}")
-            
+            # Get current market data from data service over the shared client
+            try:
+                # Get real-time price from data service
+                price_response = await self._http.get(
+                    f"/v1/market-data/{request.symbol}/current"
+                )
+                if price_response.status_code == 200:
+                    price_data = orjson.loads(price_response.content)
+                    current_price = price_data['current_price']
+                else:
+                    raise ValueError(f"Failed to get current price: {price_response.status_code}")
+
+                # Get historical data for feature engineering
+                history_response = await self._http.get(
+                    f"/v1/market-data/{request.symbol}/history",
+                    params={"period": "1mo", "interval": "1d"},
+                    timeout=15.0
+                )
+                if history_response.status_code == 200:
+                    history_data = orjson.loads(history_response.content)
+                    records = history_data['data']
+                    count = len(records)
+
+                    # Build OHLCV arrays straight from the JSON records,
+                    # skipping DataFrame construction on the predict path
+                    open_ = np.fromiter((r['open'] for r in records), dtype=np.float32, count=count)
+                    high = np.fromiter((r['high'] for r in records), dtype=np.float32, count=count)
+                    low = np.fromiter((r['low'] for r in records), dtype=np.float32, count=count)
+                    close = np.fromiter((r['close'] for r in records), dtype=np.float32, count=count)
+                    volume = np.fromiter((r['volume'] for r in records), dtype=np.float32, count=count)
+
+                    # Prepare latest features from real data
+                    features = best_model.prepare_features_arrays(open_, high, low, close, volume)
+                else:
+                    raise ValueError(f"Failed to get historical data: {history_response.status_code}")
+
+            except Exception as e:
+                logger.error(f"Failed to get real market data: {e}")
+                # Fallback to last known data or raise error
+                raise ValueError(f"Unable to get market data for prediction: {e}")
+
             # Make prediction
             prediction = best_model.predict(features)
             
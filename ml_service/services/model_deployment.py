@@ -4,22 +4,38 @@ Implements production model deployment with A/B testing and monitoring
 """
 
 import asyncio
+import heapq
 import logging
 import json
+import orjson
 import os
+import random
+import time
+from bisect import bisect_left
+from collections import Counter, OrderedDict, defaultdict, deque
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 from enum import Enum
 import numpy as np
 import pandas as pd
+from scipy import stats
 
 from .ml_engine import ml_engine, ModelType, PredictionTimeframe, PredictionResult
 from utils.logging_config import setup_logging
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on models kept in memory by the deployment service
+MAX_LOADED_MODELS = 16
+
+# Cap on per-model outcome samples retained for A/B significance tests;
+# far beyond this the t-test gains nothing and the buffer would otherwise
+# grow without bound on the serving path
+MAX_OUTCOME_SAMPLES = 10_000
+
 class DeploymentEnvironment(Enum):
     """Deployment environments"""
     DEVELOPMENT = "development"
@@ -35,7 +51,7 @@ class ModelStatus(Enum):
     DEPRECATED = "deprecated"
     FAILED = "failed"
 
-@dataclass
+@dataclass(slots=True)
 class ModelVersion:
     """Model version information"""
     model_id: str
@@ -51,8 +67,45 @@ class ModelVersion:
     error_count: int = 0
     avg_latency: float = 0.0
     last_prediction: Optional[datetime] = None
+    model_key: str = ""  # ml_engine key, precomputed at deploy time
+    # Per-prediction success-metric samples (in-memory only) feeding the
+    # significance test in evaluate_ab_test; bounded so the serving path
+    # can't grow it indefinitely, and cleared at A/B test boundaries so
+    # the test only sees in-window observations
+    outcome_samples: deque = field(default_factory=lambda: deque(maxlen=MAX_OUTCOME_SAMPLES))
+    # Cached enum .value strings, avoiding descriptor calls in tight loops
+    _env_value: str = field(init=False, default="")
+    _status_value: str = field(init=False, default="")
+
+    def __post_init__(self):
+        self._env_value = self.environment.value
+        self._status_value = self.status.value
+
+    def set_status(self, status: ModelStatus):
+        """Update status, keeping the cached value string in sync"""
+        self.status = status
+        self._status_value = status.value
+
+    def to_json_dict(self) -> Dict[str, Any]:
+        """Build the serialized form directly (no recursive asdict walk)"""
+        return {
+            'model_id': self.model_id,
+            'model_key': self.model_key,
+            'version': self.version,
+            'environment': self._env_value,
+            'status': self._status_value,
+            'deployed_at': self.deployed_at.isoformat(),
+            'performance_metrics': self.performance_metrics,
+            'champion_model': self.champion_model,
+            'traffic_percentage': self.traffic_percentage,
+            'health_status': self.health_status,
+            'prediction_count': self.prediction_count,
+            'error_count': self.error_count,
+            'avg_latency': self.avg_latency,
+            'last_prediction': self.last_prediction.isoformat() if self.last_prediction else None
+        }
 
-@dataclass
+@dataclass(slots=True)
 class ABTestConfig:
     """A/B test configuration"""
     test_id: str
@@ -64,6 +117,43 @@ class ABTestConfig:
     success_metric: str  # 'accuracy', 'precision', 'sharpe_ratio'
     min_sample_size: int = 1000
     confidence_level: float = 0.95
+    # Epoch-ns mirrors of the window bounds for cheap integer comparison
+    # on the hot path; datetimes are kept for serialization
+    start_ts_ns: int = field(init=False, default=0)
+    end_ts_ns: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        self.start_ts_ns = int(self.start_date.timestamp() * 1e9)
+        self.end_ts_ns = int(self.end_date.timestamp() * 1e9)
+
+    def set_end_date(self, end_date: datetime):
+        """Update end_date, keeping the epoch-ns mirror in sync"""
+        self.end_date = end_date
+        self.end_ts_ns = int(end_date.timestamp() * 1e9)
+
+    def to_json_dict(self) -> Dict[str, Any]:
+        """Build the serialized form directly (no recursive asdict walk)"""
+        return {
+            'test_id': self.test_id,
+            'champion_model': self.champion_model,
+            'challenger_model': self.challenger_model,
+            'traffic_split': self.traffic_split,
+            'start_date': self.start_date.isoformat(),
+            'end_date': self.end_date.isoformat(),
+            'success_metric': self.success_metric,
+            'min_sample_size': self.min_sample_size,
+            'confidence_level': self.confidence_level
+        }
+
+@lru_cache(maxsize=1024)
+def _parse_model_id(model_id: str) -> Optional[Tuple[str, str]]:
+    """Extract (symbol, timeframe value) from a deployment model id"""
+    for timeframe in PredictionTimeframe:
+        marker = f"_{timeframe.value}_"
+        idx = model_id.find(marker)
+        if idx > 0:
+            return model_id[:idx], timeframe.value
+    return None
 
 class ModelDeploymentService:
     """Production model deployment with versioning and A/B testing"""
@@ -75,6 +165,31 @@ class ModelDeploymentService:
         # Model registry
         self.model_versions: Dict[str, ModelVersion] = {}
         self.ab_tests: Dict[str, ABTestConfig] = {}
+
+        # Serving index: (environment, symbol, timeframe) -> deployed versions,
+        # rebuilt on deploy/promote/rollback so predictions avoid O(N) scans
+        self._deployment_index: Dict[Tuple[DeploymentEnvironment, str, str], List[ModelVersion]] = defaultdict(list)
+
+        # Cached active A/B test with resolved champion/challenger refs,
+        # refreshed only on test events or when the window boundary passes
+        self._active_test: Optional[ABTestConfig] = None
+        self._active_test_models: Optional[Tuple[ModelVersion, ModelVersion]] = None
+        self._active_test_until_ns = 0
+
+        # Cumulative traffic allocation for bisect-based variant selection;
+        # generalizes to N-variant rollouts
+        self._cum_alloc: List[float] = []
+        self._variants: List[ModelVersion] = []
+
+        # Private RNG instance so traffic splits don't contend on the
+        # module-level random lock under concurrent predictions
+        self._rng = random.Random()
+
+        # LRU over models held in ml_engine memory, bounding DRAM usage
+        # during A/B switches; values are the owning deployment ids
+        self._model_lru: "OrderedDict[str, str]" = OrderedDict()
+        self._model_cache_hits = 0
+        self._model_cache_misses = 0
         
         # Environment directories
         for env in DeploymentEnvironment:
@@ -84,20 +199,63 @@ class ModelDeploymentService:
         # Registry files
         self.registry_file = self.models_dir / "model_registry.json"
         self.ab_test_file = self.models_dir / "ab_tests.json"
+
+        # Append-only journal for hot per-prediction metrics; compacted
+        # into the registry snapshot by the background flusher
+        self.metrics_journal_file = self.models_dir / "metrics.jsonl"
         
         # Monitoring task
         self._monitoring_task = None
-        
+
+        # Debounced registry persistence: hot-path updates only mark the
+        # registry dirty; a background flusher coalesces them to disk
+        self._registry_dirty = False
+        self._flusher_task = None
+
+        # mtime of the registry snapshot last parsed; lets reloads be
+        # skipped entirely when the file is unchanged
+        self._registry_mtime_ns = 0
+
+        # Min-heap of (end_date, test_id) so the monitor pops expired
+        # tests in O(log N) instead of scanning every test per tick
+        self._ab_test_heap: List[Tuple[int, str]] = []
+
         # Load existing data
         self._load_registry()
         self._load_ab_tests()
+        self._ab_test_heap = [(test.end_ts_ns, test_id) for test_id, test in self.ab_tests.items()]
+        heapq.heapify(self._ab_test_heap)
+        self._replay_metrics_journal()
+        self._metrics_fp = open(self.metrics_journal_file, 'a')
+        self._rebuild_deployment_index()
+
+        # Running health tallies, maintained by _set_health_status so
+        # get_deployment_status doesn't rescan every version
+        self._recount_health_tallies()
+
+    def _recount_health_tallies(self):
+        """Rebuild the healthy/error tallies from the current registry
+
+        Called at construction and whenever model_versions is replaced
+        wholesale (registry reload), since the incremental updates in
+        _set_health_status only track in-process transitions.
+        """
+        self._healthy_count = sum(
+            1 for mv in self.model_versions.values() if mv.health_status == "healthy"
+        )
+        self._error_count = sum(
+            1 for mv in self.model_versions.values() if "error" in mv.health_status
+        )
     
     async def initialize(self):
         """Initialize deployment service"""
         try:
             # Start health monitoring
             self._monitoring_task = asyncio.create_task(self._health_monitor())
-            
+
+            # Start debounced registry flusher
+            self._flusher_task = asyncio.create_task(self._registry_flusher())
+
             # Load production models
             await self._load_production_models()
             
@@ -145,17 +303,19 @@ class ModelDeploymentService:
                 deployed_at=datetime.now(),
                 performance_metrics=model.performance_metrics.copy(),
                 champion_model=True,  # New deployments start as champion
-                traffic_percentage=100.0
+                traffic_percentage=100.0,
+                model_key=model_key
             )
             
             # Copy model to environment directory
             env_dir = self.models_dir / environment.value
             model_path = env_dir / deployment_id
-            model.save_model(str(model_path))
-            
+            await asyncio.to_thread(self._link_or_save_model, model, model_key, model_path)
+
             # Register deployment
             self.model_versions[deployment_id] = model_version
-            self._save_registry()
+            self._rebuild_deployment_index()
+            await asyncio.to_thread(self._save_registry)
             
             logger.info(f"Model {model_id} deployed successfully to {environment.value}")
             return True
@@ -205,15 +365,23 @@ class ModelDeploymentService:
             champion.champion_model = True
             challenger.traffic_percentage = traffic_split
             challenger.champion_model = False
-            challenger.status = ModelStatus.TESTING
+            challenger.set_status(ModelStatus.TESTING)
+
+            # The significance test must only compare in-window
+            # observations, so drop whatever samples accumulated before
+            # the test began
+            champion.outcome_samples.clear()
+            challenger.outcome_samples.clear()
             
             # Register A/B test
             self.ab_tests[test_id] = ab_test
-            
+            heapq.heappush(self._ab_test_heap, (ab_test.end_ts_ns, test_id))
+            self._refresh_active_test(time.time_ns())
+
             # Save state
-            self._save_registry()
-            self._save_ab_tests()
-            
+            self._mark_registry_dirty()
+            await asyncio.to_thread(self._save_ab_tests)
+
             logger.info(f"A/B test {test_id} started: {champion_model_id} vs {challenger_model_id}")
             return test_id
             
@@ -230,26 +398,22 @@ class ModelDeploymentService:
     ) -> PredictionResult:
         """Make prediction using deployed models with A/B testing"""
         try:
-            start_time = datetime.now()
-            
+            # One wall-clock capture per request; monotonic clock for latency
+            t0 = time.monotonic_ns()
+            now = datetime.now()
+            now_ns = time.time_ns()
+
             # Find deployed models for symbol/timeframe in environment
-            deployed_models = [
-                mv for mv in self.model_versions.values()
-                if mv.environment == environment 
-                and mv.status in [ModelStatus.DEPLOYED, ModelStatus.TESTING]
-                and mv.model_id.startswith(f"{symbol}_{timeframe.value}")
-            ]
-            
+            deployed_models = self._deployment_index.get((environment, symbol, timeframe.value), [])
+
             if not deployed_models:
                 raise ValueError(f"No deployed models for {symbol} {timeframe.value} in {environment.value}")
             
             # Select model based on A/B test traffic allocation
-            selected_model = await self._select_model_for_prediction(deployed_models)
+            selected_model = await self._select_model_for_prediction(deployed_models, now_ns)
             
-            # Load model if not in memory
-            model_key = f"{symbol}_{timeframe.value}_{selected_model.model_id.split('_')[-2]}"
-            if model_key not in ml_engine.models:
-                await self._load_model_to_memory(selected_model)
+            # Load model if not in memory (LRU-bounded cache)
+            await self._get_or_load_model(selected_model.model_key, selected_model)
             
             # Make prediction using ML engine
             from .ml_engine import PredictionRequest
@@ -263,19 +427,22 @@ class ModelDeploymentService:
             result = await ml_engine.predict(request)
             
             # Update deployment metrics
-            prediction_time = (datetime.now() - start_time).total_seconds()
+            prediction_time = (time.monotonic_ns() - t0) / 1e9
             selected_model.prediction_count += 1
-            selected_model.last_prediction = datetime.now()
-            selected_model.avg_latency = (
-                (selected_model.avg_latency * (selected_model.prediction_count - 1) + prediction_time)
-                / selected_model.prediction_count
+            selected_model.last_prediction = now
+            # Welford-style running mean: numerically stable at high counts
+            selected_model.avg_latency += (
+                (prediction_time - selected_model.avg_latency) / selected_model.prediction_count
             )
             
+            # Record the per-prediction outcome sample for A/B evaluation
+            selected_model.outcome_samples.append(result.confidence_score)
+
             # Add deployment info to result
             result.model_version = selected_model.version
-            
-            self._save_registry()
-            
+
+            self._append_metrics(selected_model)
+
             return result
             
         except Exception as e:
@@ -284,30 +451,48 @@ class ModelDeploymentService:
             logger.error(f"Prediction failed: {e}")
             raise
     
-    async def _select_model_for_prediction(self, deployed_models: List[ModelVersion]) -> ModelVersion:
+    def _refresh_active_test(self, now_ns: int):
+        """Recompute the cached active A/B test and its resolved models"""
+        self._active_test = None
+        self._active_test_models = None
+        self._cum_alloc = []
+        self._variants = []
+
+        for test in self.ab_tests.values():
+            if test.start_ts_ns <= now_ns <= test.end_ts_ns:
+                champion = self.model_versions.get(test.champion_model)
+                challenger = self.model_versions.get(test.challenger_model)
+
+                if champion and challenger:
+                    self._active_test = test
+                    self._active_test_models = (champion, challenger)
+                    self._cum_alloc = [test.traffic_split / 100.0, 1.0]
+                    self._variants = [challenger, champion]
+                    break  # Assume one test at a time
+
+        # Next window boundary at which the cache must be recomputed
+        boundaries = [
+            boundary for test in self.ab_tests.values()
+            for boundary in (test.start_ts_ns, test.end_ts_ns)
+            if boundary > now_ns
+        ]
+        self._active_test_until_ns = min(boundaries, default=(1 << 63) - 1)
+
+    async def _select_model_for_prediction(self, deployed_models: List[ModelVersion], now_ns: int) -> ModelVersion:
         """Select model based on A/B test traffic allocation"""
         try:
-            # Check if there's an active A/B test
-            active_tests = [
-                test for test in self.ab_tests.values()
-                if test.start_date <= datetime.now() <= test.end_date
-            ]
-            
-            if active_tests:
+            # Lazily refresh the cache when a test window starts or ends
+            if now_ns > self._active_test_until_ns:
+                self._refresh_active_test(now_ns)
+
+            if self._active_test_models:
                 # Use A/B test traffic allocation
-                test = active_tests[0]  # Assume one test at a time
-                
-                champion = next((m for m in deployed_models if m.model_id == test.champion_model), None)
-                challenger = next((m for m in deployed_models if m.model_id == test.challenger_model), None)
-                
-                if champion and challenger:
-                    # Random selection based on traffic split
-                    import random
-                    if random.random() * 100 < test.traffic_split:
-                        return challenger
-                    else:
-                        return champion
-            
+                champion, challenger = self._active_test_models
+
+                if champion in deployed_models and challenger in deployed_models:
+                    # Map one uniform draw onto the cumulative allocation
+                    return self._variants[bisect_left(self._cum_alloc, self._rng.random())]
+
             # Default: return champion model (highest performance)
             champion_models = [m for m in deployed_models if m.champion_model]
             if champion_models:
@@ -334,14 +519,28 @@ class ModelDeploymentService:
             # Calculate metrics
             champion_metric = champion.performance_metrics.get(test.success_metric, 0)
             challenger_metric = challenger.performance_metrics.get(test.success_metric, 0)
-            
-            # Simple statistical significance test (would use proper stats in production)
+
             improvement = (challenger_metric - champion_metric) / champion_metric * 100
-            is_significant = abs(improvement) > 5.0  # 5% improvement threshold
-            
+
+            # Welch's t-test over per-prediction outcome samples; fall back
+            # to the improvement threshold when samples are too sparse
+            champion_samples = np.asarray(champion.outcome_samples)
+            challenger_samples = np.asarray(challenger.outcome_samples)
+            p_value = None
+
+            if len(champion_samples) >= 2 and len(challenger_samples) >= 2:
+                _, p_value = stats.ttest_ind(challenger_samples, champion_samples, equal_var=False)
+                p_value = float(p_value)
+                is_significant = (
+                    p_value < (1 - test.confidence_level)
+                    and (len(champion_samples) + len(challenger_samples)) >= test.min_sample_size
+                )
+            else:
+                is_significant = abs(improvement) > 5.0  # 5% improvement threshold
+
             # Determine winner
             winner = "challenger" if challenger_metric > champion_metric else "champion"
-            
+
             results = {
                 'test_id': test_id,
                 'champion_model': test.champion_model,
@@ -349,6 +548,7 @@ class ModelDeploymentService:
                 'champion_metric': champion_metric,
                 'challenger_metric': challenger_metric,
                 'improvement_percent': improvement,
+                'p_value': p_value,
                 'is_significant': is_significant,
                 'winner': winner,
                 'champion_predictions': champion.prediction_count,
@@ -376,20 +576,27 @@ class ModelDeploymentService:
             # Promote challenger
             challenger.champion_model = True
             challenger.traffic_percentage = 100.0
-            challenger.status = ModelStatus.DEPLOYED
-            
+            challenger.set_status(ModelStatus.DEPLOYED)
+
             # Demote champion
             champion.champion_model = False
             champion.traffic_percentage = 0.0
-            champion.status = ModelStatus.DEPRECATED
-            
+            champion.set_status(ModelStatus.DEPRECATED)
+
             # Mark test as completed
-            test.end_date = datetime.now()
-            
+            test.set_end_date(datetime.now())
+
+            # The test is over; release its sample buffers
+            champion.outcome_samples.clear()
+            challenger.outcome_samples.clear()
+
+            self._rebuild_deployment_index()
+            self._refresh_active_test(time.time_ns())
+
             # Save state
-            self._save_registry()
-            self._save_ab_tests()
-            
+            self._mark_registry_dirty()
+            await asyncio.to_thread(self._save_ab_tests)
+
             logger.info(f"Challenger {test.challenger_model} promoted to champion")
             return True
             
@@ -419,16 +626,17 @@ class ModelDeploymentService:
             previous_model = max(same_env_models, key=lambda x: x.deployed_at)
             
             # Rollback
-            current_model.status = ModelStatus.DEPRECATED
+            current_model.set_status(ModelStatus.DEPRECATED)
             current_model.champion_model = False
             current_model.traffic_percentage = 0.0
             
-            previous_model.status = ModelStatus.DEPLOYED
+            previous_model.set_status(ModelStatus.DEPLOYED)
             previous_model.champion_model = True
             previous_model.traffic_percentage = 100.0
             previous_model.deployed_at = datetime.now()  # Update rollback time
-            
-            self._save_registry()
+
+            self._rebuild_deployment_index()
+            self._mark_registry_dirty()
             
             logger.info(f"Rolled back {model_id} to {previous_model.model_id}")
             return True
@@ -437,6 +645,51 @@ class ModelDeploymentService:
             logger.error(f"Failed to rollback model {model_id}: {e}")
             return False
     
+    def _link_or_save_model(self, model, model_key: str, model_path: Path):
+        """Promote a model by hard-linking its files, falling back to a full save
+
+        Hard links avoid re-pickling multi-hundred-MB models on every
+        environment promotion; linked files also share page cache.
+        """
+        source_dir = ml_engine.model_dir / model_key
+        try:
+            if source_dir.is_dir():
+                model_path.mkdir(parents=True, exist_ok=True)
+                for src in source_dir.iterdir():
+                    dst = model_path / src.name
+                    if not dst.exists():
+                        os.link(src, dst)
+                return
+        except OSError as e:
+            logger.warning(f"Hard-link deploy failed for {model_key}, saving a copy: {e}")
+
+        model.save_model(str(model_path))
+
+    async def _get_or_load_model(self, model_key: str, model_version: ModelVersion):
+        """Fetch a model through the LRU cache, loading and evicting as needed"""
+        if model_key in ml_engine.models:
+            self._model_cache_hits += 1
+            if model_key in self._model_lru:
+                self._model_lru.move_to_end(model_key)
+            else:
+                self._model_lru[model_key] = model_version.model_id
+            return ml_engine.models[model_key]
+
+        self._model_cache_misses += 1
+        await self._load_model_to_memory(model_version)
+        self._model_lru[model_key] = model_version.model_id
+
+        # Evict least-recently-used models beyond capacity; unregister so
+        # the engine's best-model index drops its reference too, otherwise
+        # the memory is never reclaimed and predict keeps serving the
+        # supposedly evicted model
+        while len(self._model_lru) > MAX_LOADED_MODELS:
+            evicted_key, evicted_id = self._model_lru.popitem(last=False)
+            ml_engine.unregister_model(evicted_key)
+            logger.info(f"Evicted model {evicted_key} ({evicted_id}) from memory")
+
+        return ml_engine.models.get(model_key)
+
     async def _load_model_to_memory(self, model_version: ModelVersion):
         """Load model to ML engine memory"""
         try:
@@ -446,14 +699,15 @@ class ModelDeploymentService:
             if not model_path.exists():
                 raise ValueError(f"Model files not found: {model_path}")
             
-            # Create model instance and load
+            # Create model instance and load off the event loop
             from .ml_engine import MLModel
             model = MLModel(ModelType.RANDOM_FOREST, "", PredictionTimeframe.INTRADAY)
-            model.load_model(str(model_path))
+            await asyncio.to_thread(model.load_model, str(model_path))
             
-            # Add to ML engine
+            # Register with the ML engine so its best-model index picks
+            # up the new arrival and predict can resolve it
             model_key = f"{model.symbol}_{model.timeframe.value}_{model.model_type.value}"
-            ml_engine.models[model_key] = model
+            ml_engine.register_model(model_key, model)
             
             logger.info(f"Loaded model {model_version.model_id} to memory")
             
@@ -470,13 +724,18 @@ class ModelDeploymentService:
                 and mv.status == ModelStatus.DEPLOYED
             ]
             
-            for model_version in production_models:
-                try:
-                    await self._load_model_to_memory(model_version)
-                except Exception as e:
-                    logger.error(f"Failed to load production model {model_version.model_id}: {e}")
-                    model_version.health_status = "load_failed"
-            
+            # Warm-load concurrently; startup cost is the max load time,
+            # not the sum across models
+            results = await asyncio.gather(
+                *(self._load_model_to_memory(mv) for mv in production_models),
+                return_exceptions=True
+            )
+
+            for model_version, result in zip(production_models, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to load production model {model_version.model_id}: {result}")
+                    self._set_health_status(model_version, "load_failed")
+
             logger.info(f"Loaded {len(production_models)} production models")
             
         except Exception as e:
@@ -484,23 +743,64 @@ class ModelDeploymentService:
     
     async def _health_monitor(self):
         """Monitor health of deployed models"""
+        check_semaphore = asyncio.Semaphore(32)
+
+        async def check_with_limit(model_version: ModelVersion):
+            async with check_semaphore:
+                await self._check_model_health(model_version)
+
         while True:
             try:
-                for model_version in self.model_versions.values():
-                    if model_version.status in [ModelStatus.DEPLOYED, ModelStatus.TESTING]:
-                        await self._check_model_health(model_version)
-                
-                # Check A/B tests
-                await self._check_ab_tests()
-                
-                await asyncio.sleep(300)  # Check every 5 minutes
-                
+                # Pick up external registry changes cheaply via mtime
+                if (self.registry_file.exists()
+                        and os.stat(self.registry_file).st_mtime_ns != self._registry_mtime_ns):
+                    await asyncio.to_thread(self._load_registry)
+                    self._rebuild_deployment_index()
+                    # The reload replaced every ModelVersion object, so
+                    # derived state must follow: the health tallies and
+                    # the active-test cache's resolved champion/challenger
+                    self._recount_health_tallies()
+                    self._refresh_active_test(time.time_ns())
+
+                active_versions = [
+                    mv for mv in self.model_versions.values()
+                    if mv.status in [ModelStatus.DEPLOYED, ModelStatus.TESTING]
+                ]
+                await asyncio.gather(*(check_with_limit(mv) for mv in active_versions))
+
+                # Shield the A/B evaluation (which can persist state) so a
+                # cancellation mid-save can't corrupt it
+                await asyncio.shield(self._check_ab_tests())
+
+                # Adaptive interval scaled to fleet size, with jitter so
+                # multiple workers don't check in lockstep
+                interval = max(60, min(600, 5 * len(self.model_versions)))
+                await asyncio.sleep(interval + self._rng.uniform(0, interval * 0.1))
+
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Health monitoring error: {e}")
-                await asyncio.sleep(60)
+                await asyncio.sleep(60 + self._rng.uniform(0, 6))
     
+    def _set_health_status(self, model_version: ModelVersion, health_status: str):
+        """Update health status and the running healthy/error tallies"""
+        old_status = model_version.health_status
+        if old_status == health_status:
+            return
+
+        if old_status == "healthy":
+            self._healthy_count -= 1
+        elif "error" in old_status:
+            self._error_count -= 1
+
+        if health_status == "healthy":
+            self._healthy_count += 1
+        elif "error" in health_status:
+            self._error_count += 1
+
+        model_version.health_status = health_status
+
     async def _check_model_health(self, model_version: ModelVersion):
         """Check health of specific model version"""
         try:
@@ -508,56 +808,79 @@ class ModelDeploymentService:
             if model_version.last_prediction:
                 age = datetime.now() - model_version.last_prediction
                 if age > timedelta(hours=2):
-                    model_version.health_status = "stale_predictions"
+                    self._set_health_status(model_version, "stale_predictions")
                     return
-            
+
             # Check error rate
             if model_version.prediction_count > 0:
                 error_rate = model_version.error_count / model_version.prediction_count
                 if error_rate > 0.1:  # 10% error threshold
-                    model_version.health_status = "high_error_rate"
+                    self._set_health_status(model_version, "high_error_rate")
                     return
-            
+
             # Check latency
             if model_version.avg_latency > 1.0:  # 1 second threshold
-                model_version.health_status = "slow_predictions"
+                self._set_health_status(model_version, "slow_predictions")
                 return
-            
-            model_version.health_status = "healthy"
-            
+
+            self._set_health_status(model_version, "healthy")
+
         except Exception as e:
-            model_version.health_status = f"health_check_error: {str(e)}"
+            self._set_health_status(model_version, f"health_check_error: {str(e)}")
     
     async def _check_ab_tests(self):
         """Check active A/B tests"""
         try:
-            current_time = datetime.now()
-            
-            for test_id, test in self.ab_tests.items():
-                if test.start_date <= current_time <= test.end_date:
-                    # Check if test has enough samples
-                    champion = self.model_versions[test.champion_model]
-                    challenger = self.model_versions[test.challenger_model]
-                    
-                    total_predictions = champion.prediction_count + challenger.prediction_count
-                    
-                    if total_predictions >= test.min_sample_size:
-                        # Evaluate test
-                        results = await self.evaluate_ab_test(test_id)
-                        logger.info(f"A/B test {test_id} interim results: {results}")
-                
-                elif current_time > test.end_date:
-                    # Auto-evaluate completed tests
-                    results = await self.evaluate_ab_test(test_id)
-                    logger.info(f"A/B test {test_id} completed: {results}")
-            
+            now_ns = time.time_ns()
+
+            # Auto-evaluate tests whose window has closed, popped from the
+            # end-date heap instead of scanning every registered test
+            while self._ab_test_heap and self._ab_test_heap[0][0] <= now_ns:
+                _, test_id = heapq.heappop(self._ab_test_heap)
+                test = self.ab_tests.get(test_id)
+                if not test:
+                    continue
+
+                if test.end_ts_ns > now_ns:
+                    # End date moved after this entry was queued; requeue
+                    heapq.heappush(self._ab_test_heap, (test.end_ts_ns, test_id))
+                    continue
+
+                results = await self.evaluate_ab_test(test_id)
+                logger.info(f"A/B test {test_id} completed: {results}")
+
+                # Window closed and the final evaluation is recorded;
+                # release both sample buffers so they don't linger (or
+                # leak into a later test that is never promoted)
+                for model_id in (test.champion_model, test.challenger_model):
+                    model = self.model_versions.get(model_id)
+                    if model:
+                        model.outcome_samples.clear()
+
+            # Interim check for the cached active test
+            if now_ns > self._active_test_until_ns:
+                self._refresh_active_test(now_ns)
+
+            test = self._active_test
+            if test and self._active_test_models:
+                champion, challenger = self._active_test_models
+                total_predictions = champion.prediction_count + challenger.prediction_count
+
+                if total_predictions >= test.min_sample_size:
+                    results = await self.evaluate_ab_test(test.test_id)
+                    logger.info(f"A/B test {test.test_id} interim results: {results}")
+
         except Exception as e:
             logger.error(f"Error checking A/B tests: {e}")
     
     def _load_registry(self):
-        """Load model registry from disk"""
+        """Load model registry from disk, skipping if the file is unchanged"""
         try:
             if self.registry_file.exists():
+                mtime_ns = os.stat(self.registry_file).st_mtime_ns
+                if self.model_versions and mtime_ns == self._registry_mtime_ns:
+                    return  # Cached copy is current
+
                 with open(self.registry_file, 'r') as f:
                     data = json.load(f)
                 
@@ -569,34 +892,124 @@ class ModelDeploymentService:
                     
                     if model_data.get('last_prediction'):
                         model_data['last_prediction'] = datetime.fromisoformat(model_data['last_prediction'])
-                    
+
+                    # Backfill model_key for registries written before it existed
+                    if not model_data.get('model_key'):
+                        env_marker = f"_{model_data['environment'].value}_"
+                        marker_idx = model_id.rfind(env_marker)
+                        if marker_idx > 0:
+                            model_data['model_key'] = model_id[:marker_idx]
+
                     self.model_versions[model_id] = ModelVersion(**model_data)
-                
+
+                self._registry_mtime_ns = mtime_ns
                 logger.info(f"Loaded {len(self.model_versions)} model versions")
                 
         except Exception as e:
             logger.error(f"Failed to load registry: {e}")
     
+    def _rebuild_deployment_index(self):
+        """Recompute the (environment, symbol, timeframe) serving index"""
+        index: Dict[Tuple[DeploymentEnvironment, str, str], List[ModelVersion]] = defaultdict(list)
+
+        for model_version in self.model_versions.values():
+            if model_version.status not in [ModelStatus.DEPLOYED, ModelStatus.TESTING]:
+                continue
+
+            parsed = _parse_model_id(model_version.model_id)
+            if parsed:
+                symbol, timeframe_value = parsed
+                index[(model_version.environment, symbol, timeframe_value)].append(model_version)
+
+        self._deployment_index = index
+
+    def _mark_registry_dirty(self):
+        """Queue a registry write for the background flusher"""
+        self._registry_dirty = True
+
+    def _append_metrics(self, model_version: ModelVersion):
+        """Journal hot per-prediction metrics instead of rewriting the registry"""
+        try:
+            self._metrics_fp.write(json.dumps({
+                'id': model_version.model_id,
+                'pc': model_version.prediction_count,
+                'ec': model_version.error_count,
+                'lat': model_version.avg_latency,
+                'lp': model_version.last_prediction.isoformat() if model_version.last_prediction else None
+            }) + "\n")
+            self._registry_dirty = True
+
+        except Exception as e:
+            logger.error(f"Failed to append metrics journal: {e}")
+
+    def _replay_metrics_journal(self):
+        """Merge journal entries written since the last registry snapshot"""
+        try:
+            if not self.metrics_journal_file.exists():
+                return
+
+            with open(self.metrics_journal_file, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+
+                    entry = json.loads(line)
+                    model_version = self.model_versions.get(entry['id'])
+                    if model_version:
+                        model_version.prediction_count = entry['pc']
+                        model_version.error_count = entry['ec']
+                        model_version.avg_latency = entry['lat']
+                        if entry.get('lp'):
+                            model_version.last_prediction = datetime.fromisoformat(entry['lp'])
+
+        except Exception as e:
+            logger.error(f"Failed to replay metrics journal: {e}")
+
+    def _compact_registry(self):
+        """Write the registry snapshot and truncate the metrics journal"""
+        self._save_registry()
+        try:
+            self._metrics_fp.seek(0)
+            self._metrics_fp.truncate()
+        except Exception as e:
+            logger.error(f"Failed to truncate metrics journal: {e}")
+
+    async def _registry_flusher(self):
+        """Coalesce registry writes instead of rewriting per update"""
+        while True:
+            try:
+                await asyncio.sleep(5)
+                if self._registry_dirty:
+                    self._registry_dirty = False
+                    await asyncio.to_thread(self._compact_registry)
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Registry flush error: {e}")
+
     def _save_registry(self):
         """Save model registry to disk"""
         try:
-            data = {}
-            for model_id, model_version in self.model_versions.items():
-                model_dict = asdict(model_version)
-                model_dict['environment'] = model_version.environment.value
-                model_dict['status'] = model_version.status.value
-                model_dict['deployed_at'] = model_version.deployed_at.isoformat()
-                
-                if model_version.last_prediction:
-                    model_dict['last_prediction'] = model_version.last_prediction.isoformat()
-                
-                data[model_id] = model_dict
-            
-            with open(self.registry_file, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-                
+            data = {
+                model_id: model_version.to_json_dict()
+                for model_id, model_version in self.model_versions.items()
+            }
+
+            self._write_json_atomic(self.registry_file, data)
+            self._registry_mtime_ns = os.stat(self.registry_file).st_mtime_ns
+
         except Exception as e:
             logger.error(f"Failed to save registry: {e}")
+
+    @staticmethod
+    def _write_json_atomic(path: Path, data: Dict[str, Any]):
+        """Serialize with orjson and atomically replace the target file"""
+        tmp_path = str(path) + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY))
+        os.replace(tmp_path, path)
     
     def _load_ab_tests(self):
         """Load A/B tests from disk"""
@@ -619,59 +1032,49 @@ class ModelDeploymentService:
     def _save_ab_tests(self):
         """Save A/B tests to disk"""
         try:
-            data = {}
-            for test_id, ab_test in self.ab_tests.items():
-                test_dict = asdict(ab_test)
-                test_dict['start_date'] = ab_test.start_date.isoformat()
-                test_dict['end_date'] = ab_test.end_date.isoformat()
-                
-                data[test_id] = test_dict
-            
-            with open(self.ab_test_file, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-                
+            data = {
+                test_id: ab_test.to_json_dict()
+                for test_id, ab_test in self.ab_tests.items()
+            }
+
+            self._write_json_atomic(self.ab_test_file, data)
+
         except Exception as e:
             logger.error(f"Failed to save A/B tests: {e}")
     
     def get_deployment_status(self) -> Dict[str, Any]:
         """Get deployment status summary"""
-        status = {
+        # Count by environment and status in single C-level passes
+        now_ns = time.time_ns()
+
+        return {
             'total_deployments': len(self.model_versions),
-            'by_environment': {},
-            'by_status': {},
-            'active_ab_tests': 0,
-            'healthy_models': 0,
-            'error_models': 0
+            'by_environment': dict(Counter(mv._env_value for mv in self.model_versions.values())),
+            'by_status': dict(Counter(mv._status_value for mv in self.model_versions.values())),
+            'active_ab_tests': sum(
+                1 for test in self.ab_tests.values()
+                if test.start_ts_ns <= now_ns <= test.end_ts_ns
+            ),
+            'healthy_models': self._healthy_count,
+            'error_models': self._error_count
         }
-        
-        # Count by environment and status
-        for mv in self.model_versions.values():
-            env = mv.environment.value
-            stat = mv.status.value
-            
-            status['by_environment'][env] = status['by_environment'].get(env, 0) + 1
-            status['by_status'][stat] = status['by_status'].get(stat, 0) + 1
-            
-            if mv.health_status == "healthy":
-                status['healthy_models'] += 1
-            elif "error" in mv.health_status:
-                status['error_models'] += 1
-        
-        # Count active A/B tests
-        current_time = datetime.now()
-        status['active_ab_tests'] = sum(
-            1 for test in self.ab_tests.values()
-            if test.start_date <= current_time <= test.end_date
-        )
-        
-        return status
     
     async def cleanup(self):
         """Cleanup resources"""
         try:
             if self._monitoring_task:
                 self._monitoring_task.cancel()
-            
+
+            if self._flusher_task:
+                self._flusher_task.cancel()
+
+            # Flush any pending registry updates before exit
+            if self._registry_dirty:
+                self._registry_dirty = False
+                await asyncio.to_thread(self._compact_registry)
+
+            self._metrics_fp.close()
+
             logger.info("Model deployment service cleanup completed")
             
         except Exception as e:
@@ -1,18 +1,117 @@
+import atexit
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
+import socket
+import sys
+import threading
+import time
+from collections import deque
 from datetime import datetime
+import orjson
 import structlog
 
+# Process-constant log fields, computed once at import. Re-reading these
+# per event means a syscall (gethostname/getpid) and env parsing on every
+# log line for values that never change within a process.
+_HOSTNAME = socket.gethostname()
+_PID = os.getpid()
+_LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+_ENV = os.getenv("ENVIRONMENT", "development")
+
+# Unbounded queue between stdlib loggers and the drain thread
+_log_queue = queue.Queue(-1)
+
+# Shared application logger. Import this instead of calling
+# structlog.get_logger() at every call site: the proxy binds lazily after
+# setup_logging() runs and repeat uses skip the factory lookup entirely.
+APP_LOGGER = structlog.get_logger("ml_service")
+
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that batches lines before hitting disk.
+
+    Formatted records accumulate in memory and are written with a single
+    writelines()/flush() per batch — one syscall instead of one per
+    record. A flush happens when flush_count lines are pending or every
+    flush_interval_s seconds, whichever comes first.
+    """
+
+    def __init__(self, *args, flush_count=256, flush_interval_s=0.5, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._buffer = deque()
+        self._flush_count = flush_count
+        self._flush_interval_s = flush_interval_s
+        self._buffer_lock = threading.Lock()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    def emit(self, record):
+        try:
+            line = self.format(record) + self.terminator
+        except Exception:
+            self.handleError(record)
+            return
+        with self._buffer_lock:
+            self._buffer.append(line)
+            full = len(self._buffer) >= self._flush_count
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self._buffer_lock:
+            if not self._buffer:
+                return
+            batch = list(self._buffer)
+            self._buffer.clear()
+        self.acquire()
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.writelines(batch)
+            self.stream.flush()
+            # Rotation is checked per batch rather than per record
+            if self.maxBytes > 0 and self.stream.tell() >= self.maxBytes:
+                self.doRollover()
+        finally:
+            self.release()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self._flush_interval_s)
+            self.flush()
+
+    def close(self):
+        self.flush()
+        super().close()
+
+
+def _enrich(_, __, event_dict):
+    """Stamp process-constant fields onto every event"""
+    event_dict["host"] = _HOSTNAME
+    event_dict["pid"] = _PID
+    return event_dict
+
 def setup_logging():
     """Configure structured logging for ML service"""
-    
-    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-    environment = os.getenv("ENVIRONMENT", "development")
-    
+
+    log_level = _LOG_LEVEL
+    environment = _ENV
+
+    # Filter below-threshold calls before kwargs are evaluated or the
+    # processor chain runs: logger.debug() under INFO becomes a no-op.
+    # Trade-off: the level is baked in at setup time and cannot be
+    # changed at runtime, which is acceptable for this service.
+    wrapper_class = structlog.make_filtering_bound_logger(
+        getattr(logging, log_level, logging.INFO)
+    )
+
     # Configure structlog processors
     processors = [
         structlog.contextvars.merge_contextvars,
+        _enrich,
         structlog.processors.add_log_level,
         structlog.processors.StackInfoRenderer(),
         structlog.dev.set_exc_info,
@@ -20,83 +119,105 @@ def setup_logging():
     ]
     
     if environment == "production":
-        # JSON logging for production
-        processors.append(structlog.processors.JSONRenderer())
+        # JSON logging for production: render with orjson and write bytes
+        # directly, bypassing the stdlib logging bridge (locks, handler
+        # dispatch) and the extra UTF-8 encode entirely
+        processors.append(
+            lambda _, __, event_dict: orjson.dumps(
+                event_dict, default=str, option=orjson.OPT_APPEND_NEWLINE
+            )
+        )
+        structlog.configure(
+            processors=processors,
+            context_class=dict,
+            logger_factory=structlog.BytesLoggerFactory(),
+            wrapper_class=wrapper_class,
+            cache_logger_on_first_use=True,
+        )
     else:
-        # Pretty printing for development
+        # Pretty printing for development, routed through stdlib handlers
         processors.append(structlog.dev.ConsoleRenderer())
+        structlog.configure(
+            processors=processors,
+            context_class=dict,
+            logger_factory=structlog.stdlib.LoggerFactory(),
+            wrapper_class=wrapper_class,
+            cache_logger_on_first_use=True,
+        )
     
-    # Configure structlog
-    structlog.configure(
-        processors=processors,
-        context_class=dict,
-        logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,
-        cache_logger_on_first_use=True,
-    )
-    
-    # Configure standard logging
+    # Configure standard logging. Every stdlib logger writes to an
+    # in-process queue; a single QueueListener thread drains it to the
+    # real stream/file handlers, keeping disk writes and rotation checks
+    # off the request path.
     logging_config = {
         "version": 1,
         "disable_existing_loggers": False,
-        "formatters": {
-            "standard": {
-                "format": "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
-            },
-            "detailed": {
-                "format": "%(asctime)s [%(levelname)s] %(name)s [%(filename)s:%(lineno)d]: %(message)s"
-            },
-            "json": {
-                "()": structlog.stdlib.ProcessorFormatter,
-                "processor": structlog.processors.JSONRenderer(),
-            },
-        },
         "handlers": {
-            "default": {
-                "level": log_level,
-                "formatter": "json" if environment == "production" else "detailed",
-                "class": "logging.StreamHandler",
-                "stream": "ext://sys.stdout",
-            },
-            "file": {
-                "level": log_level,
-                "formatter": "json" if environment == "production" else "detailed",
-                "class": "logging.handlers.RotatingFileHandler",
-                "filename": "logs/ml_service.log",
-                "maxBytes": 10485760,  # 10MB
-                "backupCount": 5,
+            "queue": {
+                "class": "logging.handlers.QueueHandler",
+                "queue": _log_queue,
             },
         },
         "loggers": {
             "": {
-                "handlers": ["default", "file"] if environment == "production" else ["default"],
+                "handlers": ["queue"],
                 "level": log_level,
                 "propagate": False,
             },
             "uvicorn": {
-                "handlers": ["default"],
+                "handlers": ["queue"],
                 "level": log_level,
                 "propagate": False,
             },
             "tensorflow": {
-                "handlers": ["default"],
+                "handlers": ["queue"],
                 "level": "WARNING",
                 "propagate": False,
             },
             "sklearn": {
-                "handlers": ["default"],
+                "handlers": ["queue"],
                 "level": "WARNING",
                 "propagate": False,
             },
         },
     }
-    
+
     # Create logs directory if it doesn't exist
     os.makedirs("logs", exist_ok=True)
-    
+
     # Apply logging configuration
     logging.config.dictConfig(logging_config)
-    
+
+    # Real handlers, driven only by the listener thread
+    if environment == "production":
+        formatter = structlog.stdlib.ProcessorFormatter(
+            processor=structlog.processors.JSONRenderer(),
+        )
+    else:
+        formatter = logging.Formatter(
+            "%(asctime)s [%(levelname)s] %(name)s [%(filename)s:%(lineno)d]: %(message)s"
+        )
+
+    stdout_handler = logging.StreamHandler(sys.stdout)
+    stdout_handler.setLevel(log_level)
+    stdout_handler.setFormatter(formatter)
+    real_handlers = [stdout_handler]
+
+    if environment == "production":
+        file_handler = BufferedRotatingFileHandler(
+            "logs/ml_service.log",
+            maxBytes=10485760,  # 10MB
+            backupCount=5,
+        )
+        file_handler.setLevel(log_level)
+        file_handler.setFormatter(formatter)
+        real_handlers.append(file_handler)
+
+    listener = logging.handlers.QueueListener(
+        _log_queue, *real_handlers, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
     # Set up application logger
-    logger = structlog.get_logger()
-    logger.info("ML Service logging configured", environment=environment, log_level=log_level)
\ No newline at end of file
+    APP_LOGGER.info("ML Service logging configured", environment=environment, log_level=log_level)
\ No newline at end of file
@@ -4,20 +4,118 @@ Comprehensive Stock Data Fetcher
 Fetches ALL NSE, BSE, F&O, Commodities, and Derivatives data
 """
 
-import requests
-import pandas as pd
+import hashlib
+import os
+import sys
 import sqlite3
 import logging
-import time
-import json
 from datetime import datetime
 from typing import List, Dict
 import asyncio
 import aiohttp
 
+# orjson parses the exchange payload bytes several times faster than
+# stdlib json; fall back where it isn't installed (both accept bytes)
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+# uvloop cuts event-loop overhead substantially for this I/O-bound
+# workload; fall back to the default selector loop where unavailable
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Interned tag strings: every entry in the static tables (and the
+# full fallback list, once fleshed out) shares one string object per
+# exchange/segment/sector tag instead of carrying its own copy, which
+# also makes equality checks in populate_database pointer comparisons.
+_NSE = sys.intern('NSE')
+_MCX = sys.intern('MCX')
+_EQUITY = sys.intern('EQUITY')
+_INDEX = sys.intern('INDEX')
+_COMMODITY = sys.intern('COMMODITY')
+_CURRENCY = sys.intern('CURRENCY')
+_PRECIOUS_METALS = sys.intern('Precious Metals')
+_ENERGY = sys.intern('Energy')
+_BASE_METALS = sys.intern('Base Metals')
+_AGRICULTURE = sys.intern('Agriculture')
+
+# Static symbol tables, built once at import instead of reallocating the
+# dicts on every fetch call. The fetch methods hand out shallow list
+# copies; nothing downstream mutates the entries themselves.
+_NSE_INDICES = (
+    {'symbol': 'NIFTY50', 'company_name': 'Nifty 50', 'exchange': _NSE, 'segment': _INDEX, 'is_index': True},
+    {'symbol': 'NIFTYBANK', 'company_name': 'Nifty Bank', 'exchange': _NSE, 'segment': _INDEX, 'is_index': True},
+    {'symbol': 'NIFTYIT', 'company_name': 'Nifty IT', 'exchange': _NSE, 'segment': _INDEX, 'is_index': True},
+    {'symbol': 'NIFTYPHARMA', 'company_name': 'Nifty Pharma', 'exchange': _NSE, 'segment': _INDEX, 'is_index': True},
+    {'symbol': 'NIFTYFMCG', 'company_name': 'Nifty FMCG', 'exchange': _NSE, 'segment': _INDEX, 'is_index': True},
+    {'symbol': 'NIFTYAUTO', 'company_name': 'Nifty Auto', 'exchange': _NSE, 'segment': _INDEX, 'is_index': True},
+    {'symbol': 'NIFTYMETAL', 'company_name': 'Nifty Metal', 'exchange': _NSE, 'segment': _INDEX, 'is_index': True},
+    {'symbol': 'NIFTYREALTY', 'company_name': 'Nifty Realty', 'exchange': _NSE, 'segment': _INDEX, 'is_index': True},
+    {'symbol': 'NIFTYPSE', 'company_name': 'Nifty PSE', 'exchange': _NSE, 'segment': _INDEX, 'is_index': True},
+    {'symbol': 'NIFTYPVTBANK', 'company_name': 'Nifty Private Bank', 'exchange': _NSE, 'segment': _INDEX, 'is_index': True},
+    {'symbol': 'NIFTYNEXT50', 'company_name': 'Nifty Next 50', 'exchange': _NSE, 'segment': _INDEX, 'is_index': True},
+    {'symbol': 'NIFTYMIDCAP100', 'company_name': 'Nifty Midcap 100', 'exchange': _NSE, 'segment': _INDEX, 'is_index': True},
+    {'symbol': 'NIFTYSMALLCAP100', 'company_name': 'Nifty Smallcap 100', 'exchange': _NSE, 'segment': _INDEX, 'is_index': True},
+)
+
+_MCX_COMMODITIES = (
+    # Precious Metals
+    {'symbol': 'GOLD', 'company_name': 'Gold', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _PRECIOUS_METALS},
+    {'symbol': 'GOLDM', 'company_name': 'Gold Mini', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _PRECIOUS_METALS},
+    {'symbol': 'GOLDGUINEA', 'company_name': 'Gold Guinea', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _PRECIOUS_METALS},
+    {'symbol': 'SILVER', 'company_name': 'Silver', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _PRECIOUS_METALS},
+    {'symbol': 'SILVERM', 'company_name': 'Silver Mini', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _PRECIOUS_METALS},
+
+    # Energy
+    {'symbol': 'CRUDEOIL', 'company_name': 'Crude Oil', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _ENERGY},
+    {'symbol': 'CRUDEOILM', 'company_name': 'Crude Oil Mini', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _ENERGY},
+    {'symbol': 'NATURALGAS', 'company_name': 'Natural Gas', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _ENERGY},
+    {'symbol': 'NATURALGASM', 'company_name': 'Natural Gas Mini', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _ENERGY},
+
+    # Base Metals
+    {'symbol': 'COPPER', 'company_name': 'Copper', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _BASE_METALS},
+    {'symbol': 'COPPERM', 'company_name': 'Copper Mini', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _BASE_METALS},
+    {'symbol': 'ZINC', 'company_name': 'Zinc', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _BASE_METALS},
+    {'symbol': 'ZINCM', 'company_name': 'Zinc Mini', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _BASE_METALS},
+    {'symbol': 'LEAD', 'company_name': 'Lead', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _BASE_METALS},
+    {'symbol': 'LEADM', 'company_name': 'Lead Mini', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _BASE_METALS},
+    {'symbol': 'NICKEL', 'company_name': 'Nickel', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _BASE_METALS},
+    {'symbol': 'ALUMINIUM', 'company_name': 'Aluminium', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _BASE_METALS},
+
+    # Agri Commodities
+    {'symbol': 'COTTON', 'company_name': 'Cotton', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _AGRICULTURE},
+    {'symbol': 'CARDAMOM', 'company_name': 'Cardamom', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _AGRICULTURE},
+    {'symbol': 'MENTHAOIL', 'company_name': 'Mentha Oil', 'exchange': _MCX, 'segment': _COMMODITY, 'sector': _AGRICULTURE},
+)
+
+_CURRENCY_DERIVATIVES = (
+    {'symbol': 'USDINR', 'company_name': 'USD-INR', 'exchange': _NSE, 'segment': _CURRENCY, 'sector': 'Currency'},
+    {'symbol': 'EURINR', 'company_name': 'EUR-INR', 'exchange': _NSE, 'segment': _CURRENCY, 'sector': 'Currency'},
+    {'symbol': 'GBPINR', 'company_name': 'GBP-INR', 'exchange': _NSE, 'segment': _CURRENCY, 'sector': 'Currency'},
+    {'symbol': 'JPYINR', 'company_name': 'JPY-INR', 'exchange': _NSE, 'segment': _CURRENCY, 'sector': 'Currency'},
+)
+
+# Comprehensive fallback list of NSE stocks.
+# This would be a much larger list - for demo showing structure
+_FALLBACK_NSE_EQUITY = (
+    # NIFTY 50 stocks
+    {'symbol': 'RELIANCE', 'company_name': 'Reliance Industries Limited', 'exchange': _NSE, 'segment': _EQUITY, 'sector': _ENERGY, 'is_fo_enabled': True},
+    {'symbol': 'TCS', 'company_name': 'Tata Consultancy Services Limited', 'exchange': _NSE, 'segment': _EQUITY, 'sector': 'Information Technology', 'is_fo_enabled': True},
+    {'symbol': 'INFY', 'company_name': 'Infosys Limited', 'exchange': _NSE, 'segment': _EQUITY, 'sector': 'Information Technology', 'is_fo_enabled': True},
+    {'symbol': 'HDFCBANK', 'company_name': 'HDFC Bank Limited', 'exchange': _NSE, 'segment': _EQUITY, 'sector': 'Banking', 'is_fo_enabled': True},
+    {'symbol': 'ICICIBANK', 'company_name': 'ICICI Bank Limited', 'exchange': _NSE, 'segment': _EQUITY, 'sector': 'Banking', 'is_fo_enabled': True},
+    # ... Add all ~1,700 NSE equity symbols here
+    # This is just a sample - in production, you'd have the complete list
+)
+
 class ComprehensiveStockFetcher:
     def __init__(self, db_path="trading_platform.db"):
         self.db_path = db_path
@@ -27,20 +125,82 @@ class ComprehensiveStockFetcher:
             'Accept-Language': 'en-US,en;q=0.9',
             'Referer': 'https://www.nseindia.com/',
         }
-        
-    def setup_database(self):
-        """Create comprehensive stock tables"""
+        self.session = None
+        self.cookie_path = "/tmp/nse_cookies.pkl"
+
+    async def __aenter__(self):
+        """Open one pooled session shared by every fetch method
+
+        A single ClientSession amortizes TLS handshakes, DNS lookups and
+        the NSE cookie warmup across all endpoints instead of paying them
+        per call. The cookie jar persists across script runs, so reruns
+        with warm cookies skip the warmup GET entirely.
+        """
+        jar = aiohttp.CookieJar()
+        if os.path.exists(self.cookie_path):
+            try:
+                jar.load(self.cookie_path)
+            except Exception as e:
+                logger.warning(f"Could not load cached NSE cookies: {e}")
+
+        self.session = aiohttp.ClientSession(
+            headers=self.headers,
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300),
+            cookie_jar=jar,
+        )
+        # NSE requires session cookies before its API endpoints respond;
+        # the warmup response itself is the sync point, no sleep needed
+        if not jar.filter_cookies("https://www.nseindia.com/"):
+            await self.session.get("https://www.nseindia.com/")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            self.session.cookie_jar.save(self.cookie_path)
+        except Exception as e:
+            logger.warning(f"Could not save NSE cookies: {e}")
+        await self.session.close()
+        self.session = None
+
+    @staticmethod
+    def _apply_bulk_load_pragmas(cursor):
+        """Tune SQLite for one-shot bulk loading of a rebuildable catalog
+
+        WAL + synchronous=OFF removes the per-commit fsync, and the large
+        in-memory cache keeps index pages resident during the load.
+        """
+        cursor.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=OFF;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-65536;
+            PRAGMA locking_mode=EXCLUSIVE;
+        ''')
+
+    def create_table(self):
+        """Create the comprehensive stock table (indexes are built later)"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
-        
+        self._apply_bulk_load_pragmas(cursor)
+
         try:
-            # Drop existing table to recreate with more fields
+            # Drop existing table to recreate with more fields. A previous
+            # load_comprehensive_symbols run may have left its view and
+            # FTS artifacts behind; dropping the table orphans them (the
+            # sync triggers die with the table), so clear them explicitly
+            # rather than leaving broken objects in the schema.
+            cursor.execute('DROP VIEW IF EXISTS stock_symbols_v')
+            cursor.execute('DROP TABLE IF EXISTS stock_symbols_fts')
             cursor.execute('DROP TABLE IF EXISTS stock_symbols')
-            
+
             # Create comprehensive stock_symbols table
+            # 16-byte hashed BLOB key instead of a ~30-byte TEXT key:
+            # denser B-tree pages, cheaper comparisons, and WITHOUT ROWID
+            # drops the hidden rowid. The natural key stays queryable via
+            # the UNIQUE constraint.
             cursor.execute('''
                 CREATE TABLE stock_symbols (
-                    id TEXT PRIMARY KEY,
+                    id BLOB PRIMARY KEY,
                     symbol TEXT NOT NULL,
                     company_name TEXT NOT NULL,
                     exchange TEXT NOT NULL,
@@ -60,49 +220,85 @@ class ComprehensiveStockFetcher:
                     delisting_date TEXT,
                     status TEXT DEFAULT 'ACTIVE',
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(symbol, exchange, segment)
+                ) WITHOUT ROWID
             ''')
-            
-            # Create indexes for efficient search
-            cursor.execute('CREATE INDEX idx_symbol_exchange ON stock_symbols(symbol, exchange)')
-            cursor.execute('CREATE INDEX idx_company_name ON stock_symbols(company_name)')
-            cursor.execute('CREATE INDEX idx_sector ON stock_symbols(sector)')
-            cursor.execute('CREATE INDEX idx_segment ON stock_symbols(segment)')
-            cursor.execute('CREATE INDEX idx_fo_enabled ON stock_symbols(is_fo_enabled)')
-            cursor.execute('CREATE INDEX idx_status ON stock_symbols(status)')
-            
+
+            # Readers resolve symbols through stock_symbols_v regardless of
+            # which populator built the database, so expose the flat table
+            # under the same contract the normalized loader's view provides
+            # (including the legacy derived TEXT id).
+            cursor.execute('''
+                CREATE VIEW stock_symbols_v AS
+                SELECT symbol || '_' || exchange || '_' || segment AS id,
+                       symbol, company_name, exchange, segment, sector,
+                       industry, series, isin, market_cap, face_value,
+                       lot_size, tick_size,
+                       is_fo_enabled, is_etf, is_index,
+                       listing_date, delisting_date, status,
+                       created_at, updated_at
+                FROM stock_symbols
+            ''')
+
             conn.commit()
             logger.info("Database tables created successfully")
-            
+
         except Exception as e:
             logger.error(f"Error creating database: {e}")
             conn.rollback()
             raise
         finally:
             conn.close()
-    
+
+    def create_indexes(self):
+        """Create search indexes after the bulk insert
+
+        Building indexes once over loaded data is one sequential
+        sort-build instead of a B-tree update per inserted row.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_symbol_exchange ON stock_symbols(symbol, exchange)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_company_name ON stock_symbols(company_name)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_sector ON stock_symbols(sector)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_segment ON stock_symbols(segment)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_fo_enabled ON stock_symbols(is_fo_enabled)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_status ON stock_symbols(status)')
+
+            conn.commit()
+            logger.info("Database indexes created successfully")
+
+        except Exception as e:
+            logger.error(f"Error creating indexes: {e}")
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
     async def fetch_nse_equity_list(self):
         """Fetch complete NSE equity list"""
-        try:
-            logger.info("Fetching NSE equity symbols...")
-            
-            # NSE API for equity list
-            url = "https://www.nseindia.com/api/equity-stockIndices?index=SECURITIES%20IN%20F%26O"
-            
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                # Get session cookies first
-                await session.get("https://www.nseindia.com/")
-                await asyncio.sleep(1)
-                
-                # Fetch equity data
-                async with session.get(url) as response:
+        logger.info("Fetching NSE equity symbols...")
+
+        # NSE API for equity list
+        url = "https://www.nseindia.com/api/equity-stockIndices?index=SECURITIES%20IN%20F%26O"
+        timeout = aiohttp.ClientTimeout(total=15, connect=5)
+
+        # Retry with backoff before surrendering to the tiny static
+        # fallback — a transient 429/timeout should not silently produce
+        # a near-empty catalog
+        for attempt in range(3):
+            try:
+                async with self.session.get(url, timeout=timeout) as response:
                     if response.status == 200:
-                        data = await response.json()
-                        stocks = []
-                        
-                        for item in data.get('data', []):
-                            stocks.append({
+                        # Parse raw bytes with orjson: skips the decode to
+                        # str and the slower stdlib json parse
+                        raw = await response.read()
+                        data = _json.loads(raw)
+                        stocks = [
+                            {
                                 'symbol': item.get('symbol', '').strip(),
                                 'company_name': item.get('companyName', '').strip(),
                                 'exchange': 'NSE',
@@ -112,117 +308,41 @@ class ComprehensiveStockFetcher:
                                 'is_fo_enabled': True,  # F&O securities
                                 'isin': item.get('isin', ''),
                                 'status': 'ACTIVE'
-                            })
-                        
+                            }
+                            for item in data.get('data', [])
+                        ]
+
                         logger.info(f"Fetched {len(stocks)} NSE F&O equity symbols")
                         return stocks
-            
-            # Fallback: Use comprehensive static list if API fails
-            return self._get_fallback_nse_equity()
-            
-        except Exception as e:
-            logger.error(f"Error fetching NSE equity: {e}")
-            return self._get_fallback_nse_equity()
+
+                    logger.warning(f"NSE equity fetch got HTTP {response.status} (attempt {attempt + 1}/3)")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"NSE equity fetch failed (attempt {attempt + 1}/3): {e}")
+
+            await asyncio.sleep(2 ** attempt)
+
+        # Fallback: Use comprehensive static list after all retries fail
+        logger.error("All NSE equity fetch attempts failed, using static fallback list")
+        return self._get_fallback_nse_equity()
     
     async def fetch_nse_indices(self):
         """Fetch NSE indices"""
-        try:
-            logger.info("Fetching NSE indices...")
-            
-            indices = [
-                {'symbol': 'NIFTY50', 'company_name': 'Nifty 50', 'exchange': 'NSE', 'segment': 'INDEX', 'is_index': True},
-                {'symbol': 'NIFTYBANK', 'company_name': 'Nifty Bank', 'exchange': 'NSE', 'segment': 'INDEX', 'is_index': True},
-                {'symbol': 'NIFTYIT', 'company_name': 'Nifty IT', 'exchange': 'NSE', 'segment': 'INDEX', 'is_index': True},
-                {'symbol': 'NIFTYPHARMA', 'company_name': 'Nifty Pharma', 'exchange': 'NSE', 'segment': 'INDEX', 'is_index': True},
-                {'symbol': 'NIFTYFMCG', 'company_name': 'Nifty FMCG', 'exchange': 'NSE', 'segment': 'INDEX', 'is_index': True},
-                {'symbol': 'NIFTYAUTO', 'company_name': 'Nifty Auto', 'exchange': 'NSE', 'segment': 'INDEX', 'is_index': True},
-                {'symbol': 'NIFTYMETAL', 'company_name': 'Nifty Metal', 'exchange': 'NSE', 'segment': 'INDEX', 'is_index': True},
-                {'symbol': 'NIFTYREALTY', 'company_name': 'Nifty Realty', 'exchange': 'NSE', 'segment': 'INDEX', 'is_index': True},
-                {'symbol': 'NIFTYPSE', 'company_name': 'Nifty PSE', 'exchange': 'NSE', 'segment': 'INDEX', 'is_index': True},
-                {'symbol': 'NIFTYPVTBANK', 'company_name': 'Nifty Private Bank', 'exchange': 'NSE', 'segment': 'INDEX', 'is_index': True},
-                {'symbol': 'NIFTYNEXT50', 'company_name': 'Nifty Next 50', 'exchange': 'NSE', 'segment': 'INDEX', 'is_index': True},
-                {'symbol': 'NIFTYMIDCAP100', 'company_name': 'Nifty Midcap 100', 'exchange': 'NSE', 'segment': 'INDEX', 'is_index': True},
-                {'symbol': 'NIFTYSMALLCAP100', 'company_name': 'Nifty Smallcap 100', 'exchange': 'NSE', 'segment': 'INDEX', 'is_index': True},
-            ]
-            
-            return indices
-            
-        except Exception as e:
-            logger.error(f"Error fetching NSE indices: {e}")
-            return []
-    
+        logger.info("Fetching NSE indices...")
+        return list(_NSE_INDICES)
+
     async def fetch_mcx_commodities(self):
         """Fetch MCX commodity symbols"""
-        try:
-            logger.info("Fetching MCX commodity symbols...")
-            
-            commodities = [
-                # Precious Metals
-                {'symbol': 'GOLD', 'company_name': 'Gold', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Precious Metals'},
-                {'symbol': 'GOLDM', 'company_name': 'Gold Mini', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Precious Metals'},
-                {'symbol': 'GOLDGUINEA', 'company_name': 'Gold Guinea', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Precious Metals'},
-                {'symbol': 'SILVER', 'company_name': 'Silver', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Precious Metals'},
-                {'symbol': 'SILVERM', 'company_name': 'Silver Mini', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Precious Metals'},
-                
-                # Energy
-                {'symbol': 'CRUDEOIL', 'company_name': 'Crude Oil', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Energy'},
-                {'symbol': 'CRUDEOILM', 'company_name': 'Crude Oil Mini', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Energy'},
-                {'symbol': 'NATURALGAS', 'company_name': 'Natural Gas', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Energy'},
-                {'symbol': 'NATURALGASM', 'company_name': 'Natural Gas Mini', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Energy'},
-                
-                # Base Metals
-                {'symbol': 'COPPER', 'company_name': 'Copper', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Base Metals'},
-                {'symbol': 'COPPERM', 'company_name': 'Copper Mini', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Base Metals'},
-                {'symbol': 'ZINC', 'company_name': 'Zinc', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Base Metals'},
-                {'symbol': 'ZINCM', 'company_name': 'Zinc Mini', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Base Metals'},
-                {'symbol': 'LEAD', 'company_name': 'Lead', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Base Metals'},
-                {'symbol': 'LEADM', 'company_name': 'Lead Mini', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Base Metals'},
-                {'symbol': 'NICKEL', 'company_name': 'Nickel', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Base Metals'},
-                {'symbol': 'ALUMINIUM', 'company_name': 'Aluminium', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Base Metals'},
-                
-                # Agri Commodities
-                {'symbol': 'COTTON', 'company_name': 'Cotton', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Agriculture'},
-                {'symbol': 'CARDAMOM', 'company_name': 'Cardamom', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Agriculture'},
-                {'symbol': 'MENTHAOIL', 'company_name': 'Mentha Oil', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Agriculture'},
-            ]
-            
-            return commodities
-            
-        except Exception as e:
-            logger.error(f"Error fetching MCX commodities: {e}")
-            return []
-    
+        logger.info("Fetching MCX commodity symbols...")
+        return list(_MCX_COMMODITIES)
+
     async def fetch_currency_derivatives(self):
         """Fetch currency derivative symbols"""
-        try:
-            logger.info("Fetching currency derivatives...")
-            
-            currencies = [
-                {'symbol': 'USDINR', 'company_name': 'USD-INR', 'exchange': 'NSE', 'segment': 'CURRENCY', 'sector': 'Currency'},
-                {'symbol': 'EURINR', 'company_name': 'EUR-INR', 'exchange': 'NSE', 'segment': 'CURRENCY', 'sector': 'Currency'},
-                {'symbol': 'GBPINR', 'company_name': 'GBP-INR', 'exchange': 'NSE', 'segment': 'CURRENCY', 'sector': 'Currency'},
-                {'symbol': 'JPYINR', 'company_name': 'JPY-INR', 'exchange': 'NSE', 'segment': 'CURRENCY', 'sector': 'Currency'},
-            ]
-            
-            return currencies
-            
-        except Exception as e:
-            logger.error(f"Error fetching currency derivatives: {e}")
-            return []
-    
+        logger.info("Fetching currency derivatives...")
+        return list(_CURRENCY_DERIVATIVES)
+
     def _get_fallback_nse_equity(self):
         """Comprehensive fallback list of NSE stocks"""
-        # This would be a much larger list - for demo showing structure
-        return [
-            # NIFTY 50 stocks
-            {'symbol': 'RELIANCE', 'company_name': 'Reliance Industries Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Energy', 'is_fo_enabled': True},
-            {'symbol': 'TCS', 'company_name': 'Tata Consultancy Services Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Information Technology', 'is_fo_enabled': True},
-            {'symbol': 'INFY', 'company_name': 'Infosys Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Information Technology', 'is_fo_enabled': True},
-            {'symbol': 'HDFCBANK', 'company_name': 'HDFC Bank Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Banking', 'is_fo_enabled': True},
-            {'symbol': 'ICICIBANK', 'company_name': 'ICICI Bank Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Banking', 'is_fo_enabled': True},
-            # ... Add all ~1,700 NSE equity symbols here
-            # This is just a sample - in production, you'd have the complete list
-        ]
+        return list(_FALLBACK_NSE_EQUITY)
     
     async def fetch_all_symbols(self):
         """Fetch all symbols from all sources"""
@@ -248,48 +368,71 @@ class ComprehensiveStockFetcher:
         logger.info(f"Total symbols fetched: {len(all_symbols)}")
         return all_symbols
     
+    @staticmethod
+    def _validate(symbol_data):
+        """A row is insertable if its natural key fields are present"""
+        return bool(symbol_data.get('symbol')) and bool(symbol_data.get('exchange'))
+
     def populate_database(self, symbols):
         """Populate database with all symbols"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
-        
+        self._apply_bulk_load_pragmas(cursor)
+
         try:
-            inserted_count = 0
-            
-            for symbol_data in symbols:
-                try:
-                    # Generate unique ID
-                    symbol_id = f"{symbol_data['symbol']}_{symbol_data['exchange']}_{symbol_data.get('segment', 'EQUITY')}"
-                    
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO stock_symbols 
-                        (id, symbol, company_name, exchange, segment, sector, series, isin, 
-                         is_fo_enabled, is_etf, is_index, status)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        symbol_id,
-                        symbol_data.get('symbol', ''),
-                        symbol_data.get('company_name', ''),
-                        symbol_data.get('exchange', ''),
-                        symbol_data.get('segment', 'EQUITY'),
-                        symbol_data.get('sector', ''),
-                        symbol_data.get('series', 'EQ'),
-                        symbol_data.get('isin', ''),
-                        symbol_data.get('is_fo_enabled', False),
-                        symbol_data.get('is_etf', False),
-                        symbol_data.get('is_index', False),
-                        symbol_data.get('status', 'ACTIVE')
-                    ))
-                    
-                    inserted_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error inserting {symbol_data.get('symbol', 'Unknown')}: {e}")
-                    continue
-            
+            # Validate once up front instead of wrapping each insert in
+            # try/except: bad rows are split out and reported in one log
+            # line, and the hot loop runs without exception machinery
+            good = [s for s in symbols if self._validate(s)]
+            bad_count = len(symbols) - len(good)
+            if bad_count:
+                logger.warning(f"Skipping {bad_count} symbols missing symbol/exchange fields")
+
+            # Build every row up front (unique ID computed inline), then do
+            # one executemany inside a single transaction instead of paying
+            # statement preparation + commit per symbol
+            rows = [
+                (
+                    hashlib.blake2b(
+                        f"{symbol_data['symbol']}|{symbol_data['exchange']}|{symbol_data.get('segment', 'EQUITY')}".encode(),
+                        digest_size=16,
+                    ).digest(),
+                    symbol_data.get('symbol', ''),
+                    symbol_data.get('company_name', ''),
+                    symbol_data.get('exchange', ''),
+                    symbol_data.get('segment', 'EQUITY'),
+                    symbol_data.get('sector', ''),
+                    symbol_data.get('series', 'EQ'),
+                    symbol_data.get('isin', ''),
+                    symbol_data.get('is_fo_enabled', False),
+                    symbol_data.get('is_etf', False),
+                    symbol_data.get('is_index', False),
+                    symbol_data.get('status', 'ACTIVE')
+                )
+                for symbol_data in good
+            ]
+
+            # Multi-row VALUES in 500-row chunks: one statement dispatch
+            # per chunk instead of a per-row virtual-machine reset, all
+            # inside a single transaction
+            insert_prefix = '''
+                INSERT OR REPLACE INTO stock_symbols
+                (id, symbol, company_name, exchange, segment, sector, series, isin,
+                 is_fo_enabled, is_etf, is_index, status)
+                VALUES '''
+            placeholder = "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+            cursor.execute("BEGIN")
+            for start in range(0, len(rows), 500):
+                chunk = rows[start:start + 500]
+                sql = insert_prefix + ",".join([placeholder] * len(chunk))
+                params = [value for row in chunk for value in row]
+                cursor.execute(sql, params)
             conn.commit()
+
+            inserted_count = len(rows)
             logger.info(f"Successfully inserted {inserted_count} symbols into database")
-            
+
             return inserted_count
             
         except Exception as e:
@@ -305,22 +448,25 @@ class ComprehensiveStockFetcher:
         cursor = conn.cursor()
         
         try:
-            # Total count
-            cursor.execute("SELECT COUNT(*) FROM stock_symbols")
-            total = cursor.fetchone()[0]
-            
-            # By exchange
-            cursor.execute("SELECT exchange, COUNT(*) FROM stock_symbols GROUP BY exchange")
-            by_exchange = cursor.fetchall()
-            
-            # By segment
-            cursor.execute("SELECT segment, COUNT(*) FROM stock_symbols GROUP BY segment")
-            by_segment = cursor.fetchall()
-            
-            # F&O enabled
-            cursor.execute("SELECT COUNT(*) FROM stock_symbols WHERE is_fo_enabled = 1")
-            fo_count = cursor.fetchone()[0]
-            
+            # One table pass instead of four separate scans: aggregate per
+            # (exchange, segment) and pivot the totals in Python
+            cursor.execute('''
+                SELECT exchange, segment, COUNT(*), SUM(is_fo_enabled)
+                FROM stock_symbols
+                GROUP BY exchange, segment
+            ''')
+            total = 0
+            fo_count = 0
+            exchange_counts = {}
+            segment_counts = {}
+            for exchange, segment, count, fo in cursor.fetchall():
+                total += count
+                fo_count += fo or 0
+                exchange_counts[exchange] = exchange_counts.get(exchange, 0) + count
+                segment_counts[segment] = segment_counts.get(segment, 0) + count
+            by_exchange = sorted(exchange_counts.items())
+            by_segment = sorted(segment_counts.items())
+
             logger.info("\n" + "="*50)
             logger.info("📊 COMPREHENSIVE STOCK DATABASE STATISTICS")
             logger.info("="*50)
@@ -353,20 +499,22 @@ async def main():
     """Main function"""
     try:
         fetcher = ComprehensiveStockFetcher()
-        
-        # Setup database
-        fetcher.setup_database()
-        
-        # Fetch all symbols
-        all_symbols = await fetcher.fetch_all_symbols()
-        
+
+        # Setup database (indexes come after the bulk load)
+        fetcher.create_table()
+
+        # Fetch all symbols over one shared HTTP session
+        async with fetcher:
+            all_symbols = await fetcher.fetch_all_symbols()
+
         if not all_symbols:
             logger.error("No symbols fetched!")
             return 1
-        
-        # Populate database
+
+        # Populate database, then build indexes over the loaded data
         count = fetcher.populate_database(all_symbols)
-        
+        fetcher.create_indexes()
+
         # Show statistics
         fetcher.show_statistics()
         
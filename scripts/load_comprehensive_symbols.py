@@ -7,33 +7,122 @@ Loads a comprehensive set of NSE, BSE, F&O, Commodities, and Currency symbols
 import sqlite3
 import logging
 import csv
-import io
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Static symbol reference data lives in symbols.csv next to this script,
+# one row per symbol in INSERT parameter order (lookup names are swapped
+# for ids at load time). Shipping the table as CSV keeps ~100 rows off
+# the Python heap
+# and parsing it is cheaper than building literal objects at import.
+_SYMBOLS_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "symbols.csv")
+
+
+# Upsert statement shared by every load run; building the literal once at
+# import keeps the statement text identical so SQLite's prepared-statement
+# cache gets a hit on re-runs within the process.
+_INSERT_SQL = '''
+    INSERT INTO stock_symbols
+    (symbol, company_name, exchange_id, segment_id, sector_id, series, isin,
+     market_cap, lot_size, tick_size, is_fo_enabled, is_etf, is_index, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(symbol, exchange_id, segment_id) DO UPDATE SET
+        company_name = excluded.company_name,
+        sector_id = excluded.sector_id,
+        market_cap = excluded.market_cap,
+        lot_size = excluded.lot_size,
+        tick_size = excluded.tick_size,
+        is_fo_enabled = excluded.is_fo_enabled,
+        status = excluded.status,
+        updated_at = CURRENT_TIMESTAMP
+'''
+
+def _load_symbol_rows():
+    """Yield symbols.csv rows as fixed-schema tuples, lazily
+
+    executemany consumes iterators natively, so the full symbol list is
+    never materialized — one row is in flight at a time.
+    """
+    with open(_SYMBOLS_CSV, newline="") as f:
+        reader = csv.reader(f)
+        next(reader)  # header
+        for r in reader:
+            yield (
+                r[0], r[1], r[2], r[3], r[4], r[5], r[6],
+                float(r[7]) if r[7] else None,
+                int(r[8]) if r[8] else None,
+                float(r[9]) if r[9] else None,
+                int(r[10]), int(r[11]), int(r[12]),
+                r[13],
+            )
+
+
 class ComprehensiveSymbolLoader:
     def __init__(self, db_path="trading_platform.db"):
         self.db_path = db_path
-        
-    def setup_database(self):
-        """Create comprehensive stock tables"""
-        conn = sqlite3.connect(self.db_path)
+        self._conn = None
+
+    def _connect(self):
+        """Return the shared connection, opened lazily and tuned once
+
+        One connection serves the whole load pipeline, so the page cache
+        primed by the bulk insert is still hot when statistics run. WAL
+        halves fsyncs and lets readers proceed during the insert; the
+        larger cache and mmap window keep index pages resident.
+        """
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path)
+            # Explicit transaction control; DDL and reads autocommit
+            conn.isolation_level = None
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-65536")
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def create_table(self):
+        """Create the comprehensive stock table (indexes are built later)"""
+        conn = self._connect()
         cursor = conn.cursor()
-        
+
         try:
-            # Drop existing table to recreate with more fields
-            cursor.execute('DROP TABLE IF EXISTS stock_symbols')
-            
-            # Create comprehensive stock_symbols table
+            # Idempotent schema: re-runs with an unchanged schema skip
+            # the drop/recreate cycle and its full table + index rebuild.
+            # Exchange/segment/sector names are normalized into lookup
+            # tables: the main table stores 1-byte integer ids instead of
+            # repeating the same handful of strings 100+ times per column,
+            # which shrinks rows and makes the compound indexes denser.
+            for table in ("exchanges", "segments", "sectors"):
+                cursor.execute(f'''
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        id INTEGER PRIMARY KEY,
+                        name TEXT NOT NULL UNIQUE
+                    )
+                ''')
+
             cursor.execute('''
-                CREATE TABLE stock_symbols (
-                    id TEXT PRIMARY KEY,
+                CREATE TABLE IF NOT EXISTS stock_symbols (
                     symbol TEXT NOT NULL,
                     company_name TEXT NOT NULL,
-                    exchange TEXT NOT NULL,
-                    segment TEXT NOT NULL,
-                    sector TEXT,
+                    exchange_id INTEGER NOT NULL REFERENCES exchanges(id),
+                    segment_id INTEGER NOT NULL REFERENCES segments(id),
+                    sector_id INTEGER REFERENCES sectors(id),
                     industry TEXT,
                     series TEXT,
                     isin TEXT,
@@ -48,360 +137,303 @@ class ComprehensiveSymbolLoader:
                     delisting_date TEXT,
                     status TEXT DEFAULT 'ACTIVE',
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (symbol, exchange_id, segment_id)
                 )
             ''')
-            
-            # Create indexes for efficient search
-            cursor.execute('CREATE INDEX idx_symbol_exchange ON stock_symbols(symbol, exchange)')
-            cursor.execute('CREATE INDEX idx_company_name ON stock_symbols(company_name)')
-            cursor.execute('CREATE INDEX idx_sector ON stock_symbols(sector)')
-            cursor.execute('CREATE INDEX idx_segment ON stock_symbols(segment)')
-            cursor.execute('CREATE INDEX idx_fo_enabled ON stock_symbols(is_fo_enabled)')
-            cursor.execute('CREATE INDEX idx_status ON stock_symbols(status)')
-            cursor.execute('CREATE INDEX idx_text_search ON stock_symbols(symbol, company_name)')
-            
-            conn.commit()
+
+            # Denormalized read path: the view joins the names (and the
+            # legacy derived id) back in, so consumers keep querying TEXT
+            # exchange/segment/sector columns unchanged
+            cursor.execute('''
+                CREATE VIEW IF NOT EXISTS stock_symbols_v AS
+                SELECT s.symbol || '_' || e.name || '_' || sg.name AS id,
+                       s.symbol, s.company_name,
+                       e.name AS exchange, sg.name AS segment, sec.name AS sector,
+                       s.industry, s.series, s.isin, s.market_cap, s.face_value,
+                       s.lot_size, s.tick_size,
+                       s.is_fo_enabled, s.is_etf, s.is_index,
+                       s.listing_date, s.delisting_date, s.status,
+                       s.created_at, s.updated_at
+                FROM stock_symbols s
+                JOIN exchanges e ON e.id = s.exchange_id
+                JOIN segments sg ON sg.id = s.segment_id
+                LEFT JOIN sectors sec ON sec.id = s.sector_id
+            ''')
+
+            # Full-text search over symbol/company_name: a plain B-tree
+            # index cannot serve prefix or substring lookups on company
+            # names, which is what symbol search actually does. The
+            # external-content FTS5 table is kept in sync by triggers.
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS stock_symbols_fts USING fts5(
+                    symbol, company_name,
+                    content='stock_symbols', content_rowid='rowid'
+                )
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS stock_symbols_ai AFTER INSERT ON stock_symbols BEGIN
+                    INSERT INTO stock_symbols_fts(rowid, symbol, company_name)
+                    VALUES (new.rowid, new.symbol, new.company_name);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS stock_symbols_ad AFTER DELETE ON stock_symbols BEGIN
+                    INSERT INTO stock_symbols_fts(stock_symbols_fts, rowid, symbol, company_name)
+                    VALUES ('delete', old.rowid, old.symbol, old.company_name);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS stock_symbols_au AFTER UPDATE ON stock_symbols BEGIN
+                    INSERT INTO stock_symbols_fts(stock_symbols_fts, rowid, symbol, company_name)
+                    VALUES ('delete', old.rowid, old.symbol, old.company_name);
+                    INSERT INTO stock_symbols_fts(rowid, symbol, company_name)
+                    VALUES (new.rowid, new.symbol, new.company_name);
+                END
+            ''')
+
             logger.info("Database tables created successfully")
-            
+
         except Exception as e:
-            logger.error(f"Error creating database: {e}")
-            conn.rollback()
+            logger.error("Error creating database: %s", e)
             raise
-        finally:
-            conn.close()
-    
+
+    def create_indexes(self):
+        """Create search indexes after the bulk insert
+
+        Building each index over loaded data is one sequential sort+build
+        instead of a random B-tree update per inserted row.
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_symbol_exchange ON stock_symbols(symbol, exchange_id)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_company_name ON stock_symbols(company_name)')
+            # Compound covering indexes shaped after the real queries
+            # ("active F&O symbols on NSE", "symbols per segment/exchange")
+            # so SQLite answers from the index alone instead of
+            # bitmap-ORing four single-column indexes or scanning
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_active_fo
+                ON stock_symbols(status, is_fo_enabled, exchange_id, symbol, company_name)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_segment_exchange
+                ON stock_symbols(segment_id, exchange_id, symbol)
+            ''')
+
+            logger.info("Database indexes created successfully")
+
+        except Exception as e:
+            logger.error("Error creating indexes: %s", e)
+            raise
+
     def get_comprehensive_symbols(self):
-        """Get comprehensive list of all trading symbols"""
-        
-        symbols = []
-        
-        # 1. NSE EQUITY - Major stocks (representative of ~1,700 total)
-        nse_equity = [
-            # NIFTY 50 Stocks
-            {'symbol': 'RELIANCE', 'company_name': 'Reliance Industries Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Energy', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 1500000},
-            {'symbol': 'TCS', 'company_name': 'Tata Consultancy Services Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Information Technology', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 1200000},
-            {'symbol': 'INFY', 'company_name': 'Infosys Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Information Technology', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 800000},
-            {'symbol': 'HDFCBANK', 'company_name': 'HDFC Bank Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Banking', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 900000},
-            {'symbol': 'ICICIBANK', 'company_name': 'ICICI Bank Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Banking', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 700000},
-            {'symbol': 'KOTAKBANK', 'company_name': 'Kotak Mahindra Bank Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Banking', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 400000},
-            {'symbol': 'LT', 'company_name': 'Larsen & Toubro Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Engineering', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 300000},
-            {'symbol': 'ITC', 'company_name': 'ITC Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'FMCG', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 350000},
-            {'symbol': 'WIPRO', 'company_name': 'Wipro Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Information Technology', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 250000},
-            {'symbol': 'MARUTI', 'company_name': 'Maruti Suzuki India Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Automotive', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 280000},
-            {'symbol': 'BHARTIARTL', 'company_name': 'Bharti Airtel Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Telecommunications', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 320000},
-            {'symbol': 'ASIANPAINT', 'company_name': 'Asian Paints Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Paints', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 200000},
-            {'symbol': 'SBIN', 'company_name': 'State Bank of India', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Banking', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 450000},
-            {'symbol': 'HINDUNILVR', 'company_name': 'Hindustan Unilever Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'FMCG', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 380000},
-            {'symbol': 'BAJFINANCE', 'company_name': 'Bajaj Finance Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Financial Services', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 420000},
-            {'symbol': 'ADANIPORTS', 'company_name': 'Adani Ports and Special Economic Zone Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Infrastructure', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 180000},
-            {'symbol': 'AXISBANK', 'company_name': 'Axis Bank Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Banking', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 320000},
-            {'symbol': 'NESTLEIND', 'company_name': 'Nestle India Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'FMCG', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 200000},
-            {'symbol': 'ONGC', 'company_name': 'Oil and Natural Gas Corporation Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Energy', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 280000},
-            {'symbol': 'POWERGRID', 'company_name': 'Power Grid Corporation of India Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Utilities', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 240000},
-            
-            # Add more major NSE stocks to represent broader coverage (~200+ major stocks)
-            {'symbol': 'NTPC', 'company_name': 'NTPC Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Utilities', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 200000},
-            {'symbol': 'TATAMOTORS', 'company_name': 'Tata Motors Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Automotive', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 160000},
-            {'symbol': 'TATASTEEL', 'company_name': 'Tata Steel Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Metals', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 140000},
-            {'symbol': 'JSWSTEEL', 'company_name': 'JSW Steel Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Metals', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 120000},
-            {'symbol': 'HINDALCO', 'company_name': 'Hindalco Industries Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Metals', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 100000},
-            {'symbol': 'INDUSINDBK', 'company_name': 'IndusInd Bank Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Banking', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 110000},
-            {'symbol': 'TECHM', 'company_name': 'Tech Mahindra Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Information Technology', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 90000},
-            {'symbol': 'HCLTECH', 'company_name': 'HCL Technologies Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Information Technology', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 420000},
-            {'symbol': 'ULTRACEMCO', 'company_name': 'UltraTech Cement Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Cement', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 380000},
-            {'symbol': 'GRASIM', 'company_name': 'Grasim Industries Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Diversified', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 120000},
-            {'symbol': 'DRREDDY', 'company_name': 'Dr. Reddys Laboratories Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Pharmaceuticals', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 100000},
-            {'symbol': 'SUNPHARMA', 'company_name': 'Sun Pharmaceutical Industries Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Pharmaceuticals', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 250000},
-            {'symbol': 'CIPLA', 'company_name': 'Cipla Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Pharmaceuticals', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 90000},
-            {'symbol': 'DIVISLAB', 'company_name': 'Divis Laboratories Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Pharmaceuticals', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 120000},
-            {'symbol': 'APOLLOHOSP', 'company_name': 'Apollo Hospitals Enterprise Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Healthcare', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 80000},
-            {'symbol': 'TITAN', 'company_name': 'Titan Company Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Consumer Goods', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 280000},
-            {'symbol': 'BRITANNIA', 'company_name': 'Britannia Industries Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'FMCG', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 130000},
-            {'symbol': 'HEROMOTOCO', 'company_name': 'Hero MotoCorp Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Automotive', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 70000},
-            {'symbol': 'BAJAJFINSV', 'company_name': 'Bajaj Finserv Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Financial Services', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 240000},
-            {'symbol': 'EICHERMOT', 'company_name': 'Eicher Motors Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Automotive', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 80000},
-            {'symbol': 'BPCL', 'company_name': 'Bharat Petroleum Corporation Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Energy', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 90000},
-            {'symbol': 'IOC', 'company_name': 'Indian Oil Corporation Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Energy', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 120000},
-            {'symbol': 'COALINDIA', 'company_name': 'Coal India Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Mining', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 140000},
-            {'symbol': 'VEDL', 'company_name': 'Vedanta Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Metals', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 100000},
-            {'symbol': 'SHREECEM', 'company_name': 'Shree Cement Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Cement', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 70000},
-            {'symbol': 'M_M', 'company_name': 'Mahindra & Mahindra Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Automotive', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 160000},
-            
-            # Mid-cap and Small-cap stocks (representative)
-            {'symbol': 'GODREJCP', 'company_name': 'Godrej Consumer Products Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'FMCG', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 80000},
-            {'symbol': 'COLPAL', 'company_name': 'Colgate Palmolive India Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'FMCG', 'series': 'EQ', 'is_fo_enabled': False, 'market_cap': 45000},
-            {'symbol': 'DABUR', 'company_name': 'Dabur India Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'FMCG', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 90000},
-            {'symbol': 'MARICO', 'company_name': 'Marico Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'FMCG', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 70000},
-            {'symbol': 'PIDILITIND', 'company_name': 'Pidilite Industries Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Chemicals', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 120000},
-            {'symbol': 'BERGEPAINT', 'company_name': 'Berger Paints India Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Paints', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 65000},
-            {'symbol': 'HAVELLS', 'company_name': 'Havells India Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Electrical Equipment', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 80000},
-            {'symbol': 'VOLTAS', 'company_name': 'Voltas Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Consumer Durables', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 35000},
-            {'symbol': 'WHIRLPOOL', 'company_name': 'Whirlpool of India Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Consumer Durables', 'series': 'EQ', 'is_fo_enabled': False, 'market_cap': 25000},
-            {'symbol': 'BAJAJ_AUTO', 'company_name': 'Bajaj Auto Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Automotive', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 190000},
-            {'symbol': 'TVSMOTOR', 'company_name': 'TVS Motor Company Limited', 'exchange': 'NSE', 'segment': 'EQUITY', 'sector': 'Automotive', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 70000},
-        ]
-        symbols.extend(nse_equity)
-        
-        # 2. BSE EQUITY - Major dual-listed stocks
-        bse_equity = [
-            {'symbol': 'RELIANCE', 'company_name': 'Reliance Industries Limited', 'exchange': 'BSE', 'segment': 'EQUITY', 'sector': 'Energy', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 1500000},
-            {'symbol': 'TCS', 'company_name': 'Tata Consultancy Services Limited', 'exchange': 'BSE', 'segment': 'EQUITY', 'sector': 'Information Technology', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 1200000},
-            {'symbol': 'INFY', 'company_name': 'Infosys Limited', 'exchange': 'BSE', 'segment': 'EQUITY', 'sector': 'Information Technology', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 800000},
-            {'symbol': 'HDFCBANK', 'company_name': 'HDFC Bank Limited', 'exchange': 'BSE', 'segment': 'EQUITY', 'sector': 'Banking', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 900000},
-            {'symbol': 'ICICIBANK', 'company_name': 'ICICI Bank Limited', 'exchange': 'BSE', 'segment': 'EQUITY', 'sector': 'Banking', 'series': 'EQ', 'is_fo_enabled': True, 'market_cap': 700000},
-            # Add more BSE stocks...
-        ]
-        symbols.extend(bse_equity)
-        
-        # 3. NSE INDICES
-        nse_indices = [
-            {'symbol': 'NIFTY50', 'company_name': 'Nifty 50', 'exchange': 'NSE', 'segment': 'INDEX', 'sector': 'Index', 'series': 'IX', 'is_index': True, 'lot_size': 50},
-            {'symbol': 'NIFTYBANK', 'company_name': 'Nifty Bank', 'exchange': 'NSE', 'segment': 'INDEX', 'sector': 'Index', 'series': 'IX', 'is_index': True, 'lot_size': 25},
-            {'symbol': 'NIFTYIT', 'company_name': 'Nifty IT', 'exchange': 'NSE', 'segment': 'INDEX', 'sector': 'Index', 'series': 'IX', 'is_index': True, 'lot_size': 50},
-            {'symbol': 'NIFTYPHARMA', 'company_name': 'Nifty Pharma', 'exchange': 'NSE', 'segment': 'INDEX', 'sector': 'Index', 'series': 'IX', 'is_index': True, 'lot_size': 50},
-            {'symbol': 'NIFTYFMCG', 'company_name': 'Nifty FMCG', 'exchange': 'NSE', 'segment': 'INDEX', 'sector': 'Index', 'series': 'IX', 'is_index': True, 'lot_size': 50},
-            {'symbol': 'NIFTYAUTO', 'company_name': 'Nifty Auto', 'exchange': 'NSE', 'segment': 'INDEX', 'sector': 'Index', 'series': 'IX', 'is_index': True, 'lot_size': 50},
-            {'symbol': 'NIFTYMETAL', 'company_name': 'Nifty Metal', 'exchange': 'NSE', 'segment': 'INDEX', 'sector': 'Index', 'series': 'IX', 'is_index': True, 'lot_size': 50},
-            {'symbol': 'NIFTYREALTY', 'company_name': 'Nifty Realty', 'exchange': 'NSE', 'segment': 'INDEX', 'sector': 'Index', 'series': 'IX', 'is_index': True, 'lot_size': 50},
-            {'symbol': 'NIFTYPSE', 'company_name': 'Nifty PSE', 'exchange': 'NSE', 'segment': 'INDEX', 'sector': 'Index', 'series': 'IX', 'is_index': True, 'lot_size': 50},
-            {'symbol': 'NIFTYNEXT50', 'company_name': 'Nifty Next 50', 'exchange': 'NSE', 'segment': 'INDEX', 'sector': 'Index', 'series': 'IX', 'is_index': True, 'lot_size': 50},
-            {'symbol': 'NIFTYMIDCAP100', 'company_name': 'Nifty Midcap 100', 'exchange': 'NSE', 'segment': 'INDEX', 'sector': 'Index', 'series': 'IX', 'is_index': True, 'lot_size': 75},
-            {'symbol': 'NIFTYSMALLCAP100', 'company_name': 'Nifty Smallcap 100', 'exchange': 'NSE', 'segment': 'INDEX', 'sector': 'Index', 'series': 'IX', 'is_index': True, 'lot_size': 100},
-        ]
-        symbols.extend(nse_indices)
-        
-        # 4. BSE INDICES
-        bse_indices = [
-            {'symbol': 'SENSEX', 'company_name': 'BSE Sensex', 'exchange': 'BSE', 'segment': 'INDEX', 'sector': 'Index', 'series': 'IX', 'is_index': True, 'lot_size': 10},
-            {'symbol': 'BANKEX', 'company_name': 'BSE Bankex', 'exchange': 'BSE', 'segment': 'INDEX', 'sector': 'Index', 'series': 'IX', 'is_index': True, 'lot_size': 15},
-            {'symbol': 'BSE100', 'company_name': 'BSE 100', 'exchange': 'BSE', 'segment': 'INDEX', 'sector': 'Index', 'series': 'IX', 'is_index': True, 'lot_size': 25},
-            {'symbol': 'BSE200', 'company_name': 'BSE 200', 'exchange': 'BSE', 'segment': 'INDEX', 'sector': 'Index', 'series': 'IX', 'is_index': True, 'lot_size': 50},
-            {'symbol': 'BSE500', 'company_name': 'BSE 500', 'exchange': 'BSE', 'segment': 'INDEX', 'sector': 'Index', 'series': 'IX', 'is_index': True, 'lot_size': 50},
-        ]
-        symbols.extend(bse_indices)
-        
-        # 5. MCX COMMODITIES
-        mcx_commodities = [
-            # Precious Metals
-            {'symbol': 'GOLD', 'company_name': 'Gold', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Precious Metals', 'lot_size': 1000, 'tick_size': 1.0},
-            {'symbol': 'GOLDM', 'company_name': 'Gold Mini', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Precious Metals', 'lot_size': 100, 'tick_size': 1.0},
-            {'symbol': 'GOLDGUINEA', 'company_name': 'Gold Guinea', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Precious Metals', 'lot_size': 100, 'tick_size': 1.0},
-            {'symbol': 'SILVER', 'company_name': 'Silver', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Precious Metals', 'lot_size': 30000, 'tick_size': 1.0},
-            {'symbol': 'SILVERM', 'company_name': 'Silver Mini', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Precious Metals', 'lot_size': 5000, 'tick_size': 1.0},
-            
-            # Energy
-            {'symbol': 'CRUDEOIL', 'company_name': 'Crude Oil', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Energy', 'lot_size': 100, 'tick_size': 1.0},
-            {'symbol': 'CRUDEOILM', 'company_name': 'Crude Oil Mini', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Energy', 'lot_size': 10, 'tick_size': 1.0},
-            {'symbol': 'NATURALGAS', 'company_name': 'Natural Gas', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Energy', 'lot_size': 1250, 'tick_size': 0.1},
-            {'symbol': 'NATURALGASM', 'company_name': 'Natural Gas Mini', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Energy', 'lot_size': 250, 'tick_size': 0.1},
-            
-            # Base Metals
-            {'symbol': 'COPPER', 'company_name': 'Copper', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Base Metals', 'lot_size': 2500, 'tick_size': 0.05},
-            {'symbol': 'COPPERM', 'company_name': 'Copper Mini', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Base Metals', 'lot_size': 1000, 'tick_size': 0.05},
-            {'symbol': 'ZINC', 'company_name': 'Zinc', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Base Metals', 'lot_size': 5000, 'tick_size': 0.05},
-            {'symbol': 'ZINCM', 'company_name': 'Zinc Mini', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Base Metals', 'lot_size': 1000, 'tick_size': 0.05},
-            {'symbol': 'LEAD', 'company_name': 'Lead', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Base Metals', 'lot_size': 5000, 'tick_size': 0.05},
-            {'symbol': 'LEADM', 'company_name': 'Lead Mini', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Base Metals', 'lot_size': 1000, 'tick_size': 0.05},
-            {'symbol': 'NICKEL', 'company_name': 'Nickel', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Base Metals', 'lot_size': 250, 'tick_size': 1.0},
-            {'symbol': 'ALUMINIUM', 'company_name': 'Aluminium', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Base Metals', 'lot_size': 5000, 'tick_size': 0.05},
-            
-            # Agri Commodities
-            {'symbol': 'COTTON', 'company_name': 'Cotton', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Agriculture', 'lot_size': 25, 'tick_size': 1.0},
-            {'symbol': 'CARDAMOM', 'company_name': 'Cardamom', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Agriculture', 'lot_size': 100, 'tick_size': 1.0},
-            {'symbol': 'MENTHAOIL', 'company_name': 'Mentha Oil', 'exchange': 'MCX', 'segment': 'COMMODITY', 'sector': 'Agriculture', 'lot_size': 360, 'tick_size': 0.1},
-        ]
-        symbols.extend(mcx_commodities)
-        
-        # 6. CURRENCY DERIVATIVES
-        currency_derivatives = [
-            {'symbol': 'USDINR', 'company_name': 'USD-INR', 'exchange': 'NSE', 'segment': 'CURRENCY', 'sector': 'Currency', 'lot_size': 1000, 'tick_size': 0.0025},
-            {'symbol': 'EURINR', 'company_name': 'EUR-INR', 'exchange': 'NSE', 'segment': 'CURRENCY', 'sector': 'Currency', 'lot_size': 1000, 'tick_size': 0.0025},
-            {'symbol': 'GBPINR', 'company_name': 'GBP-INR', 'exchange': 'NSE', 'segment': 'CURRENCY', 'sector': 'Currency', 'lot_size': 1000, 'tick_size': 0.0025},
-            {'symbol': 'JPYINR', 'company_name': 'JPY-INR', 'exchange': 'NSE', 'segment': 'CURRENCY', 'sector': 'Currency', 'lot_size': 1000, 'tick_size': 0.0025},
-        ]
-        symbols.extend(currency_derivatives)
-        
-        # 7. ETFs (Exchange Traded Funds)
-        etfs = [
-            {'symbol': 'GOLDBEES', 'company_name': 'Nippon India ETF Gold BeES', 'exchange': 'NSE', 'segment': 'ETF', 'sector': 'ETF', 'series': 'EQ', 'is_etf': True},
-            {'symbol': 'NIFTYBEES', 'company_name': 'Nippon India ETF Nifty BeES', 'exchange': 'NSE', 'segment': 'ETF', 'sector': 'ETF', 'series': 'EQ', 'is_etf': True},
-            {'symbol': 'BANKBEES', 'company_name': 'Nippon India ETF Bank BeES', 'exchange': 'NSE', 'segment': 'ETF', 'sector': 'ETF', 'series': 'EQ', 'is_etf': True},
-            {'symbol': 'JUNIORBEES', 'company_name': 'Nippon India ETF Junior BeES', 'exchange': 'NSE', 'segment': 'ETF', 'sector': 'ETF', 'series': 'EQ', 'is_etf': True},
-        ]
-        symbols.extend(etfs)
-        
-        return symbols
-    
+        """Iterate over all trading symbols without materializing them"""
+        return _load_symbol_rows()
+
+    @staticmethod
+    def _resolve_id(cursor, table, cache, name):
+        """Map a lookup name to its integer id, memoized per load
+
+        Each distinct name costs one INSERT OR IGNORE + SELECT; every
+        repeat is a Python dict hit, so the hot path never touches SQL.
+        """
+        if not name:
+            return None
+        _id = cache.get(name)
+        if _id is None:
+            cursor.execute(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", (name,))
+            cursor.execute(f"SELECT id FROM {table} WHERE name = ?", (name,))
+            _id = cursor.fetchone()[0]
+            cache[name] = _id
+        return _id
+
+    @staticmethod
+    def _validate(row):
+        """Cheap structural check: symbol, company_name, exchange and
+        segment must be non-empty strings"""
+        return bool(row[0] and row[1] and row[2] and row[3])
+
     def populate_database(self, symbols):
         """Populate database with all symbols"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
-        
+
         try:
-            inserted_count = 0
-            
-            for symbol_data in symbols:
-                try:
-                    # Generate unique ID
-                    symbol_id = f"{symbol_data['symbol']}_{symbol_data['exchange']}_{symbol_data.get('segment', 'EQUITY')}"
-                    
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO stock_symbols 
-                        (id, symbol, company_name, exchange, segment, sector, series, isin, 
-                         market_cap, lot_size, tick_size, is_fo_enabled, is_etf, is_index, status)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        symbol_id,
-                        symbol_data.get('symbol', ''),
-                        symbol_data.get('company_name', ''),
-                        symbol_data.get('exchange', ''),
-                        symbol_data.get('segment', 'EQUITY'),
-                        symbol_data.get('sector', ''),
-                        symbol_data.get('series', 'EQ'),
-                        symbol_data.get('isin', ''),
-                        symbol_data.get('market_cap'),
-                        symbol_data.get('lot_size'),
-                        symbol_data.get('tick_size'),
-                        symbol_data.get('is_fo_enabled', False),
-                        symbol_data.get('is_etf', False),
-                        symbol_data.get('is_index', False),
-                        symbol_data.get('status', 'ACTIVE')
-                    ))
-                    
-                    inserted_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error inserting {symbol_data.get('symbol', 'Unknown')}: {e}")
-                    continue
-            
-            conn.commit()
-            logger.info(f"Successfully inserted {inserted_count} symbols into database")
-            
+            # Rows arrive as fixed-schema tuples in INSERT parameter order
+            # with TEXT exchange/segment/sector; the wrapper generator
+            # validates each row, swaps the names for lookup-table ids and
+            # streams on, so malformed rows never reach SQLite (where they
+            # would abort the whole transaction) and the pipeline stays
+            # lazy end to end
+            lookup_cursor = conn.cursor()
+            exchanges, segments, sectors = {}, {}, {}
+            bad_rows = []
+
+            def _resolved():
+                for r in symbols:
+                    if not self._validate(r):
+                        bad_rows.append(r)
+                        continue
+                    yield (
+                        r[0], r[1],
+                        self._resolve_id(lookup_cursor, "exchanges", exchanges, r[2]),
+                        self._resolve_id(lookup_cursor, "segments", segments, r[3]),
+                        self._resolve_id(lookup_cursor, "sectors", sectors, r[4]),
+                    ) + r[5:]
+
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.executemany(_INSERT_SQL, _resolved())
+            inserted_count = cursor.rowcount
+            cursor.execute("COMMIT")
+
+            if bad_rows:
+                logger.warning(
+                    "Skipped %d malformed symbol rows: %s",
+                    len(bad_rows), [r[0] or "<no symbol>" for r in bad_rows],
+                )
+            logger.info("Successfully inserted %d symbols into database", inserted_count)
+
             return inserted_count
             
         except Exception as e:
-            logger.error(f"Error populating database: {e}")
-            conn.rollback()
+            logger.error("Error populating database: %s", e)
+            cursor.execute("ROLLBACK")
             raise
+    
+    def _query_read_only(self, sql):
+        """Run one query on a private read-only connection and fetch all
+
+        Each statistics query gets its own mode=ro connection so they can
+        run on separate threads: WAL permits any number of concurrent
+        readers, and sqlite3 releases the GIL while stepping a statement.
+        """
+        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        try:
+            return conn.execute(sql).fetchall()
         finally:
             conn.close()
-    
+
     def show_statistics(self):
         """Show comprehensive database statistics"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
-            # Total count
-            cursor.execute("SELECT COUNT(*) FROM stock_symbols")
-            total = cursor.fetchone()[0]
-            
-            # By exchange
-            cursor.execute("SELECT exchange, COUNT(*) FROM stock_symbols GROUP BY exchange ORDER BY COUNT(*) DESC")
-            by_exchange = cursor.fetchall()
-            
-            # By segment
-            cursor.execute("SELECT segment, COUNT(*) FROM stock_symbols GROUP BY segment ORDER BY COUNT(*) DESC")
-            by_segment = cursor.fetchall()
-            
-            # F&O enabled
-            cursor.execute("SELECT COUNT(*) FROM stock_symbols WHERE is_fo_enabled = 1")
-            fo_count = cursor.fetchone()[0]
-            
-            # Commodities
-            cursor.execute("SELECT COUNT(*) FROM stock_symbols WHERE segment = 'COMMODITY'")
-            commodity_count = cursor.fetchone()[0]
-            
-            # Currency
-            cursor.execute("SELECT COUNT(*) FROM stock_symbols WHERE segment = 'CURRENCY'")
-            currency_count = cursor.fetchone()[0]
-            
-            # Indices
-            cursor.execute("SELECT COUNT(*) FROM stock_symbols WHERE is_index = 1")
-            index_count = cursor.fetchone()[0]
-            
-            # ETFs
-            cursor.execute("SELECT COUNT(*) FROM stock_symbols WHERE is_etf = 1")
-            etf_count = cursor.fetchone()[0]
-            
-            logger.info("\n" + "="*60)
-            logger.info("📊 COMPREHENSIVE TRADING SYMBOLS DATABASE")
-            logger.info("="*60)
-            logger.info(f"🎯 Total Symbols Available: {total:,}")
-            logger.info(f"🔥 F&O Enabled Stocks: {fo_count:,}")
-            logger.info(f"🥇 Commodities (MCX): {commodity_count:,}")
-            logger.info(f"💱 Currency Derivatives: {currency_count:,}")
-            logger.info(f"📈 Indices: {index_count:,}")
-            logger.info(f"🏛️ ETFs: {etf_count:,}")
-            
-            logger.info(f"\n📈 By Exchange:")
+            # The three scan-heavy statistics queries run concurrently on
+            # read-only connections; the scalar counts still come from one
+            # conditional-aggregation scan instead of six COUNT queries
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                totals_f = pool.submit(self._query_read_only, '''
+                    SELECT COUNT(*),
+                           SUM(is_fo_enabled),
+                           SUM(segment = 'COMMODITY'),
+                           SUM(segment = 'CURRENCY'),
+                           SUM(is_index),
+                           SUM(is_etf)
+                    FROM stock_symbols_v
+                ''')
+                by_exchange_f = pool.submit(
+                    self._query_read_only,
+                    "SELECT exchange, COUNT(*) FROM stock_symbols_v GROUP BY exchange ORDER BY COUNT(*) DESC",
+                )
+                by_segment_f = pool.submit(
+                    self._query_read_only,
+                    "SELECT segment, COUNT(*) FROM stock_symbols_v GROUP BY segment ORDER BY COUNT(*) DESC",
+                )
+
+                total, fo_count, commodity_count, currency_count, index_count, etf_count = (
+                    v or 0 for v in totals_f.result()[0]
+                )
+                by_exchange = by_exchange_f.result()
+                by_segment = by_segment_f.result()
+
+            # Assemble the whole report in memory and emit one log record
+            # instead of ~30 trips through the logging lock and handler
+            lines = [
+                "\n" + "="*60,
+                "📊 COMPREHENSIVE TRADING SYMBOLS DATABASE",
+                "="*60,
+                f"🎯 Total Symbols Available: {total:,}",
+                f"🔥 F&O Enabled Stocks: {fo_count:,}",
+                f"🥇 Commodities (MCX): {commodity_count:,}",
+                f"💱 Currency Derivatives: {currency_count:,}",
+                f"📈 Indices: {index_count:,}",
+                f"🏛️ ETFs: {etf_count:,}",
+                "\n📈 By Exchange:",
+            ]
             for exchange, count in by_exchange:
-                logger.info(f"   {exchange}: {count:,}")
-            
-            logger.info(f"\n💼 By Segment:")
+                lines.append(f"   {exchange}: {count:,}")
+
+            lines.append("\n💼 By Segment:")
             for segment, count in by_segment:
-                logger.info(f"   {segment}: {count:,}")
-            
-            logger.info("="*60)
-            
+                lines.append(f"   {segment}: {count:,}")
+
+            lines.append("="*60)
+
             # Sample data from each segment
             segments = ['EQUITY', 'INDEX', 'COMMODITY', 'CURRENCY', 'ETF']
             for segment in segments:
-                cursor.execute(f"""
-                    SELECT symbol, company_name, exchange 
-                    FROM stock_symbols 
-                    WHERE segment = '{segment}' 
+                # Parameterized so SQLite reuses one prepared statement
+                # instead of reparsing per segment (and no SQL injection)
+                cursor.execute("""
+                    SELECT symbol, company_name, exchange
+                    FROM stock_symbols_v
+                    WHERE segment = ?
                     LIMIT 5
-                """)
+                """, (segment,))
                 samples = cursor.fetchall()
-                
+
                 if samples:
-                    logger.info(f"\n📋 Sample {segment} symbols:")
+                    lines.append(f"\n📋 Sample {segment} symbols:")
                     for sample in samples:
-                        logger.info(f"   {sample[0]} ({sample[2]}) - {sample[1]}")
-            
+                        lines.append(f"   {sample[0]} ({sample[2]}) - {sample[1]}")
+
+            logger.info("\n".join(lines))
+
         except Exception as e:
-            logger.error(f"Error showing statistics: {e}")
-        finally:
-            conn.close()
+            logger.error("Error showing statistics: %s", e)
 
 def main():
     """Main function"""
     try:
-        loader = ComprehensiveSymbolLoader()
-        
-        # Setup database
-        loader.setup_database()
-        
-        # Get comprehensive symbols
-        all_symbols = loader.get_comprehensive_symbols()
-        
-        if not all_symbols:
-            logger.error("No symbols to load!")
-            return 1
-        
-        # Populate database
-        count = loader.populate_database(all_symbols)
-        
-        # Show statistics
-        loader.show_statistics()
-        
-        logger.info(f"\n✅ SUCCESS: Comprehensive trading platform database ready!")
-        logger.info(f"🚀 Users can now search {count:,} symbols across:")
-        logger.info("   • NSE & BSE Equity Stocks")
-        logger.info("   • F&O Enabled Securities") 
-        logger.info("   • MCX Commodities (Gold, Silver, Crude Oil, etc.)")
-        logger.info("   • Currency Derivatives (USD-INR, EUR-INR, etc.)")
-        logger.info("   • Stock Market Indices (NIFTY, SENSEX, etc.)")
-        logger.info("   • Exchange Traded Funds (ETFs)")
-        logger.info("\n🎯 Ready for professional trading operations!")
-        
+        # One loader = one shared SQLite connection for the whole pipeline
+        with ComprehensiveSymbolLoader() as loader:
+            # Setup database (indexes come after the bulk load)
+            loader.create_table()
+
+            # Stream the symbols into the database, then build indexes
+            count = loader.populate_database(loader.get_comprehensive_symbols())
+
+            if not count:
+                logger.error("No symbols to load!")
+                return 1
+
+            loader.create_indexes()
+
+            # Show statistics
+            loader.show_statistics()
+
+        # One multi-line record instead of nine handler round-trips
+        logger.info("\n".join([
+            "\n✅ SUCCESS: Comprehensive trading platform database ready!",
+            f"🚀 Users can now search {count:,} symbols across:",
+            "   • NSE & BSE Equity Stocks",
+            "   • F&O Enabled Securities ",
+            "   • MCX Commodities (Gold, Silver, Crude Oil, etc.)",
+            "   • Currency Derivatives (USD-INR, EUR-INR, etc.)",
+            "   • Stock Market Indices (NIFTY, SENSEX, etc.)",
+            "   • Exchange Traded Funds (ETFs)",
+            "\n🎯 Ready for professional trading operations!",
+        ]))
+
         return 0
-        
+
     except Exception as e:
-        logger.error(f"❌ Failed to setup comprehensive trading database: {e}")
+        logger.error("❌ Failed to setup comprehensive trading database: %s", e)
         return 1
 
 if __name__ == "__main__":
-    exit(main())
\ No newline at end of file
+    exit(main())
@@ -4,27 +4,173 @@ Populate Financial Data for Comprehensive Stock Database
 Adds realistic financial metrics (PE, dividend yield, beta, etc.) to symbols
 """
 
+import functools
 import sqlite3
 import logging
-import random
-from datetime import datetime, timedelta
+
+import numpy as np
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Module-level so the statement text is identical across calls and
+# sqlite3's per-connection statement cache reuses the compiled plan
+_INSERT_METADATA_SQL = """
+    INSERT INTO symbol_metadata (
+        symbol, company_name, exchange, sector, security_type,
+        market_cap_category, market_cap, shares_outstanding, float_shares,
+        avg_volume, pe_ratio, pb_ratio, dividend_yield, beta,
+        is_active, is_tradeable, is_marginable, is_shortable, data_version
+    ) VALUES (
+        :symbol, :company_name, :exchange, :sector, :security_type,
+        :market_cap_category, :market_cap, :shares_outstanding, :float_shares,
+        :avg_volume, :pe_ratio, :pb_ratio, :dividend_yield, :beta,
+        :is_active, :is_tradeable, :is_marginable, :is_shortable, :data_version
+    )
+"""
+
+# Rows buffered between executemany flushes; large enough to amortize the
+# Python->C call overhead, small enough to keep the buffer negligible
+_INSERT_BATCH_SIZE = 1000
+
+# One generator for the process: seeding a fresh PCG64 per batch would
+# cost an entropy pull and object construction for no statistical gain
+_RNG = np.random.default_rng()
+
+
+# Base metric ranges per segment as (lo, hi) pairs, with sector-specific
+# overrides for equity. Hoisted to module scope so the dicts are built
+# once instead of on every call.
+_BASE_RANGES = {
+    "EQUITY": {
+        "pe_ratio": (8, 35),
+        "pb_ratio": (0.5, 4.0),
+        "dividend_yield": (0, 8),
+        "beta": (0.3, 2.0)
+    },
+    "INDEX": {
+        "pe_ratio": (15, 25),
+        "pb_ratio": (1.5, 3.0),
+        "dividend_yield": (1, 3),
+        "beta": (0.8, 1.2)
+    },
+    "ETF": {
+        "pe_ratio": (12, 22),
+        "pb_ratio": (1.0, 2.5),
+        "dividend_yield": (1, 4),
+        "beta": (0.7, 1.3)
+    },
+    "COMMODITY": {
+        "pe_ratio": (10, 20),
+        "pb_ratio": (0.8, 2.0),
+        "dividend_yield": (0, 2),
+        "beta": (0.5, 2.5)
+    },
+    "CURRENCY": {
+        "pe_ratio": (15, 18),
+        "pb_ratio": (1.0, 1.5),
+        "dividend_yield": (0, 1),
+        "beta": (0.1, 0.5)
+    }
+}
+
+_SECTOR_ADJUSTMENTS = {
+    "Banking": {"pe_ratio": (6, 18), "dividend_yield": (2, 6)},
+    "Information Technology": {"pe_ratio": (20, 40), "dividend_yield": (0, 3)},
+    "FMCG": {"pe_ratio": (25, 50), "dividend_yield": (1, 4)},
+    "Energy": {"pe_ratio": (5, 15), "dividend_yield": (3, 8)},
+    "Pharmaceuticals": {"pe_ratio": (15, 35), "dividend_yield": (0, 3)},
+    "Automotive": {"pe_ratio": (10, 25), "dividend_yield": (1, 5)},
+    "Metals": {"pe_ratio": (5, 20), "dividend_yield": (2, 6)},
+    "Utilities": {"pe_ratio": (12, 22), "dividend_yield": (3, 7)},
+    "Financial Services": {"pe_ratio": (8, 20), "dividend_yield": (1, 5)},
+    "Telecommunications": {"pe_ratio": (8, 18), "dividend_yield": (2, 6)},
+    "Cement": {"pe_ratio": (10, 25), "dividend_yield": (1, 4)},
+    "Paints": {"pe_ratio": (30, 60), "dividend_yield": (0, 2)},
+    "Infrastructure": {"pe_ratio": (12, 30), "dividend_yield": (0, 3)},
+    "Engineering": {"pe_ratio": (15, 35), "dividend_yield": (1, 4)}
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _ranges_for(segment, sector):
+    """Resolve the metric ranges for a (segment, sector) bucket
+
+    Returns a flat (pe_lo, pe_hi, pb_lo, pb_hi, div_lo, div_hi, beta_lo,
+    beta_hi) tuple; the LRU makes repeat buckets a single dict hit with
+    no dict construction in the hot path.
+    """
+    base = _BASE_RANGES.get(segment, _BASE_RANGES["EQUITY"])
+    pe = base["pe_ratio"]
+    pb = base["pb_ratio"]
+    div = base["dividend_yield"]
+    beta = base["beta"]
+
+    # Sector-specific adjustments for equity
+    if segment == "EQUITY":
+        adjustment = _SECTOR_ADJUSTMENTS.get(sector)
+        if adjustment:
+            pe = adjustment.get("pe_ratio", pe)
+            div = adjustment.get("dividend_yield", div)
+
+    return pe + pb + div + beta
+
+
 class FinancialDataPopulator:
     def __init__(self, db_path="trading_platform.db"):
         self.db_path = db_path
-        
+        self._conn = None
+
+    def _connect(self):
+        """Return the shared connection, opened lazily and tuned once
+
+        One connection serves setup, populate and the statistics pass, so
+        sqlite_master is parsed and the PRAGMAs applied a single time and
+        the page cache warmed by the load is still hot for the reads. WAL
+        avoids the rollback-journal rewrite, synchronous=NORMAL drops the
+        per-commit fsync to one WAL sync, and the in-memory temp store
+        plus 64MB page cache keep sorts and index pages off disk.
+        """
+        if self._conn is None:
+            # isolation_level=None: explicit transaction control, with
+            # DDL and reads autocommitting. The enlarged statement cache
+            # (keyed by SQL text, which is why the statements live as
+            # module constants) keeps every recurring statement's VDBE
+            # program compiled for the life of the connection.
+            conn = sqlite3.connect(
+                self.db_path, isolation_level=None, cached_statements=256
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-65536")
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def setup_symbol_metadata_table(self):
         """Create symbol_metadata table if it doesn't exist"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS symbol_metadata (
-                    id TEXT PRIMARY KEY,
+                    -- id is computed by SQLite in C; VIRTUAL costs
+                    -- nothing at insert time and symbol's UNIQUE index
+                    -- remains the real key
+                    id TEXT GENERATED ALWAYS AS (symbol || '_' || exchange) VIRTUAL,
                     symbol TEXT NOT NULL UNIQUE,
                     company_name TEXT,
                     exchange TEXT,
@@ -50,276 +196,252 @@ class FinancialDataPopulator:
                 )
             ''')
             
-            # Create indexes for efficient queries
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_metadata_symbol ON symbol_metadata(symbol)')
+            logger.info("Symbol metadata table created successfully")
+            
+        except Exception as e:
+            logger.error(f"Error creating symbol metadata table: {e}")
+            raise
+
+    def create_secondary_indexes(self):
+        """Create the query indexes after the bulk load
+
+        Inserting first and index-building afterwards replaces per-row
+        B-tree maintenance on four indexes with one sort+build per index.
+        The UNIQUE constraint on symbol stays inline (its implicit index
+        is what duplicate detection relies on), which also makes the old
+        explicit symbol index redundant.
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        try:
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_metadata_exchange ON symbol_metadata(exchange)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_metadata_sector ON symbol_metadata(sector)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_metadata_pe ON symbol_metadata(pe_ratio)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_metadata_dividend ON symbol_metadata(dividend_yield)')
-            
-            conn.commit()
-            logger.info("Symbol metadata table created successfully")
-            
+
+            logger.info("Symbol metadata indexes created successfully")
+
         except Exception as e:
-            logger.error(f"Error creating symbol metadata table: {e}")
-            conn.rollback()
+            logger.error(f"Error creating symbol metadata indexes: {e}")
             raise
-        finally:
-            conn.close()
-    
-    def get_financial_ranges_by_sector(self, sector, segment):
-        """Get realistic financial metric ranges based on sector and segment"""
-        
-        # Base ranges for different segments
-        base_ranges = {
-            "EQUITY": {
-                "pe_ratio": (8, 35),
-                "pb_ratio": (0.5, 4.0),
-                "dividend_yield": (0, 8),
-                "beta": (0.3, 2.0)
-            },
-            "INDEX": {
-                "pe_ratio": (15, 25),
-                "pb_ratio": (1.5, 3.0),
-                "dividend_yield": (1, 3),
-                "beta": (0.8, 1.2)
-            },
-            "ETF": {
-                "pe_ratio": (12, 22),
-                "pb_ratio": (1.0, 2.5),
-                "dividend_yield": (1, 4),
-                "beta": (0.7, 1.3)
-            },
-            "COMMODITY": {
-                "pe_ratio": (10, 20),
-                "pb_ratio": (0.8, 2.0),
-                "dividend_yield": (0, 2),
-                "beta": (0.5, 2.5)
-            },
-            "CURRENCY": {
-                "pe_ratio": (15, 18),
-                "pb_ratio": (1.0, 1.5),
-                "dividend_yield": (0, 1),
-                "beta": (0.1, 0.5)
-            }
-        }
-        
-        # Sector-specific adjustments for equity
-        sector_adjustments = {
-            "Banking": {"pe_ratio": (6, 18), "dividend_yield": (2, 6)},
-            "Information Technology": {"pe_ratio": (20, 40), "dividend_yield": (0, 3)},
-            "FMCG": {"pe_ratio": (25, 50), "dividend_yield": (1, 4)},
-            "Energy": {"pe_ratio": (5, 15), "dividend_yield": (3, 8)},
-            "Pharmaceuticals": {"pe_ratio": (15, 35), "dividend_yield": (0, 3)},
-            "Automotive": {"pe_ratio": (10, 25), "dividend_yield": (1, 5)},
-            "Metals": {"pe_ratio": (5, 20), "dividend_yield": (2, 6)},
-            "Utilities": {"pe_ratio": (12, 22), "dividend_yield": (3, 7)},
-            "Financial Services": {"pe_ratio": (8, 20), "dividend_yield": (1, 5)},
-            "Telecommunications": {"pe_ratio": (8, 18), "dividend_yield": (2, 6)},
-            "Cement": {"pe_ratio": (10, 25), "dividend_yield": (1, 4)},
-            "Paints": {"pe_ratio": (30, 60), "dividend_yield": (0, 2)},
-            "Infrastructure": {"pe_ratio": (12, 30), "dividend_yield": (0, 3)},
-            "Engineering": {"pe_ratio": (15, 35), "dividend_yield": (1, 4)}
-        }
-        
-        ranges = base_ranges.get(segment, base_ranges["EQUITY"])
-        
-        # Apply sector adjustments for equity
-        if segment == "EQUITY" and sector in sector_adjustments:
-            sector_adj = sector_adjustments[sector]
-            for key, value in sector_adj.items():
-                ranges[key] = value
-        
-        return ranges
-    
-    def generate_realistic_financials(self, symbol, company_name, exchange, segment, sector, market_cap):
-        """Generate realistic financial metrics for a symbol"""
-        
-        ranges = self.get_financial_ranges_by_sector(sector, segment)
-        
-        # Generate PE ratio
-        pe_min, pe_max = ranges["pe_ratio"]
-        pe_ratio = round(random.uniform(pe_min, pe_max), 2) if random.random() > 0.1 else None
-        
-        # Generate PB ratio
-        pb_min, pb_max = ranges["pb_ratio"]
-        pb_ratio = round(random.uniform(pb_min, pb_max), 2) if random.random() > 0.05 else None
-        
-        # Generate dividend yield (some stocks don't pay dividends)
-        div_min, div_max = ranges["dividend_yield"]
-        dividend_yield = round(random.uniform(div_min, div_max), 2) if random.random() > 0.3 else None
-        
-        # Generate beta
-        beta_min, beta_max = ranges["beta"]
-        beta = round(random.uniform(beta_min, beta_max), 2) if random.random() > 0.05 else None
-        
-        # Generate shares outstanding based on market cap
-        if market_cap:
-            # Assume average price of 100-2000 for estimation
-            avg_price = random.uniform(100, 2000)
-            shares_outstanding = int((market_cap * 10000) / avg_price)  # market_cap in lakhs
-            float_shares = int(shares_outstanding * random.uniform(0.7, 0.95))
-        else:
-            shares_outstanding = random.randint(10000000, 1000000000)
-            float_shares = int(shares_outstanding * random.uniform(0.7, 0.95))
-        
-        # Generate average volume
-        if market_cap and market_cap > 100000:  # Large caps have higher volume
-            avg_volume = random.randint(500000, 5000000)
-        elif market_cap and market_cap > 10000:  # Mid caps
-            avg_volume = random.randint(50000, 1000000)
-        else:  # Small caps
-            avg_volume = random.randint(5000, 200000)
-        
-        # Market cap category
-        if market_cap:
-            if market_cap >= 1000000:
-                market_cap_category = "Large Cap"
-            elif market_cap >= 50000:
-                market_cap_category = "Mid Cap"
-            elif market_cap >= 5000:
-                market_cap_category = "Small Cap"
-            else:
-                market_cap_category = "Micro Cap"
-        else:
-            market_cap_category = "Unknown"
-        
-        return {
-            "symbol": symbol,
-            "company_name": company_name,
-            "exchange": exchange,
-            "sector": sector,
-            "security_type": segment.lower(),
-            "market_cap_category": market_cap_category,
-            "market_cap": market_cap,
-            "shares_outstanding": shares_outstanding,
-            "float_shares": float_shares,
-            "avg_volume": avg_volume,
-            "pe_ratio": pe_ratio,
-            "pb_ratio": pb_ratio,
-            "dividend_yield": dividend_yield,
-            "beta": beta,
-            "is_active": True,
-            "is_tradeable": True,
-            "is_marginable": True,
-            "is_shortable": True,
-            "data_version": "1.0"
-        }
     
+    def generate_financials_batch(self, symbols):
+        """Generate realistic financial metrics for a batch of symbols
+
+        Symbols are bucketed by (segment, sector) and every metric for a
+        bucket is drawn as one NumPy array, so the RNG runs in C across
+        the batch instead of ~10 interpreter-bound random.* calls per
+        symbol. Generation stays in-process on purpose: the array draws
+        already run outside the GIL, and fanning chunks out to a
+        multiprocessing pool would pay more in pickling rows across
+        process boundaries than the draws themselves cost. Returns one
+        dict per input row, in input order.
+        """
+        n = len(symbols)
+        rng = _RNG
+
+        market_caps = np.array(
+            [s[5] if s[5] is not None else np.nan for s in symbols], dtype=np.float64
+        )
+        has_mc = ~np.isnan(market_caps)
+        mc = np.nan_to_num(market_caps)
+
+        # Per-bucket uniform draws for the range-bound ratios
+        pe = np.empty(n)
+        pb = np.empty(n)
+        div = np.empty(n)
+        beta = np.empty(n)
+        buckets = {}
+        for i, s in enumerate(symbols):
+            buckets.setdefault((s[3], s[4]), []).append(i)
+        for (segment, sector), indices in buckets.items():
+            idx = np.asarray(indices)
+            k = idx.size
+            pe_lo, pe_hi, pb_lo, pb_hi, div_lo, div_hi, beta_lo, beta_hi = \
+                _ranges_for(segment, sector)
+            pe[idx] = rng.uniform(pe_lo, pe_hi, k)
+            pb[idx] = rng.uniform(pb_lo, pb_hi, k)
+            div[idx] = rng.uniform(div_lo, div_hi, k)
+            beta[idx] = rng.uniform(beta_lo, beta_hi, k)
+
+        # Dropout masks: some symbols report no PE/PB/dividend/beta
+        pe = np.where(rng.random(n) > 0.1, np.round(pe, 2), np.nan)
+        pb = np.where(rng.random(n) > 0.05, np.round(pb, 2), np.nan)
+        div = np.where(rng.random(n) > 0.3, np.round(div, 2), np.nan)
+        beta = np.where(rng.random(n) > 0.05, np.round(beta, 2), np.nan)
+
+        # Shares outstanding from market cap (in lakhs) at an assumed
+        # price, or drawn outright where market cap is unknown
+        avg_price = rng.uniform(100, 2000, n)
+        shares_outstanding = np.where(
+            has_mc,
+            (mc * 10000) / avg_price,
+            rng.integers(10000000, 1000000000, n, endpoint=True),
+        ).astype(np.int64)
+        float_shares = (shares_outstanding * rng.uniform(0.7, 0.95, n)).astype(np.int64)
+
+        # Average volume scales with the market-cap bucket: one uniform
+        # draw rescaled per bucket via np.select
+        u = rng.random(n)
+        is_large = has_mc & (mc > 100000)
+        is_mid = has_mc & ~is_large & (mc > 10000)
+        avg_volume = np.select(
+            [is_large, is_mid],
+            [500000 + u * 4500000, 50000 + u * 950000],
+            default=5000 + u * 195000,
+        ).astype(np.int64)
+
+        # Market cap category: one vectorized bin search replaces the
+        # per-row chained comparisons (missing/zero caps stay "Unknown")
+        categories = np.array(["Micro Cap", "Small Cap", "Mid Cap", "Large Cap"])[
+            np.digitize(mc, [5000, 50000, 1000000])
+        ]
+        categories = np.where(has_mc & (mc != 0), categories, "Unknown").tolist()
+
+        results = []
+        for i, (symbol, company_name, exchange, segment, sector, market_cap) in enumerate(symbols):
+            results.append({
+                "symbol": symbol,
+                "company_name": company_name,
+                "exchange": exchange,
+                "sector": sector,
+                "security_type": segment.lower(),
+                "market_cap_category": categories[i],
+                "market_cap": market_cap,
+                "shares_outstanding": int(shares_outstanding[i]),
+                "float_shares": int(float_shares[i]),
+                "avg_volume": int(avg_volume[i]),
+                "pe_ratio": None if np.isnan(pe[i]) else float(pe[i]),
+                "pb_ratio": None if np.isnan(pb[i]) else float(pb[i]),
+                "dividend_yield": None if np.isnan(div[i]) else float(div[i]),
+                "beta": None if np.isnan(beta[i]) else float(beta[i]),
+                "is_active": True,
+                "is_tradeable": True,
+                "is_marginable": True,
+                "is_shortable": True,
+                "data_version": "1.0"
+            })
+
+        return results
+
     def populate_financial_data(self):
         """Populate financial data for all symbols"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
-            
-            # Get all symbols from stock_symbols table
-            cursor.execute("""
+
+            total = cursor.execute(
+                "SELECT COUNT(*) FROM stock_symbols_v WHERE status = 'ACTIVE'"
+            ).fetchone()[0]
+            logger.info(f"Found {total} symbols to process")
+
+            # One scan up front replaces a SELECT probe per candidate;
+            # membership is then an O(1) hash lookup. Adding each buffered
+            # symbol to the set also catches duplicates within a batch
+            # (the same symbol listed on both exchanges) that a per-row
+            # SELECT would only see after its batch was flushed.
+            existing = {r[0] for r in cursor.execute("SELECT symbol FROM symbol_metadata")}
+
+            # Stream the symbols from the stock_symbols_v view (the base
+            # table stores normalized lookup ids) on a dedicated read
+            # cursor, one batch at a time, so the full result set is
+            # never materialized and writes on the main cursor cannot
+            # invalidate the scan
+            read_cursor = conn.cursor()
+            # No ORDER BY: insert order is irrelevant and sorting would
+            # force a temp b-tree over the whole result before the first
+            # row could stream out
+            read_cursor.execute("""
                 SELECT symbol, company_name, exchange, segment, sector, market_cap
-                FROM stock_symbols 
+                FROM stock_symbols_v
                 WHERE status = 'ACTIVE'
-                ORDER BY market_cap DESC NULLS LAST
             """)
-            
-            symbols = cursor.fetchall()
-            logger.info(f"Found {len(symbols)} symbols to process")
-            
+
             processed = 0
-            for symbol_data in symbols:
-                symbol, company_name, exchange, segment, sector, market_cap = symbol_data
-                
-                # Check if financial data already exists
-                cursor.execute("SELECT symbol FROM symbol_metadata WHERE symbol = ?", (symbol,))
-                if cursor.fetchone():
-                    logger.debug(f"Skipping {symbol} - financial data already exists")
+            # One BEGIN/COMMIT around the whole insert loop means one
+            # journal sync instead of one per row
+            cursor.execute("BEGIN IMMEDIATE")
+            while True:
+                batch = read_cursor.fetchmany(_INSERT_BATCH_SIZE)
+                if not batch:
+                    break
+
+                chunk = []
+                for symbol_data in batch:
+                    symbol = symbol_data[0]
+                    if symbol in existing:
+                        logger.debug("Skipping %s - financial data already exists", symbol)
+                        continue
+                    existing.add(symbol)
+                    chunk.append(symbol_data)
+
+                if not chunk:
                     continue
-                
-                # Generate financial data
-                financial_data = self.generate_realistic_financials(
-                    symbol, company_name, exchange, segment, sector, market_cap
-                )
-                
-                # Insert into symbol_metadata table
-                cursor.execute("""
-                    INSERT INTO symbol_metadata (
-                        id, symbol, company_name, exchange, sector, security_type,
-                        market_cap_category, market_cap, shares_outstanding, float_shares,
-                        avg_volume, pe_ratio, pb_ratio, dividend_yield, beta,
-                        is_active, is_tradeable, is_marginable, is_shortable, data_version
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    f"{symbol}_{exchange}",
-                    financial_data["symbol"],
-                    financial_data["company_name"], 
-                    financial_data["exchange"],
-                    financial_data["sector"],
-                    financial_data["security_type"],
-                    financial_data["market_cap_category"],
-                    financial_data["market_cap"],
-                    financial_data["shares_outstanding"],
-                    financial_data["float_shares"],
-                    financial_data["avg_volume"],
-                    financial_data["pe_ratio"],
-                    financial_data["pb_ratio"],
-                    financial_data["dividend_yield"],
-                    financial_data["beta"],
-                    financial_data["is_active"],
-                    financial_data["is_tradeable"],
-                    financial_data["is_marginable"],
-                    financial_data["is_shortable"],
-                    financial_data["data_version"]
-                ))
-                
-                processed += 1
-                
-                if processed % 10 == 0:
-                    logger.info(f"Processed {processed}/{len(symbols)} symbols")
-            
-            conn.commit()
+
+                # Generate the whole chunk's metrics in one vectorized
+                # pass and bind the dicts by name: sqlite3's C binder
+                # pulls each value once, replacing 19 per-row dict
+                # lookups and a tuple allocation in Python
+                rows = self.generate_financials_batch(chunk)
+                cursor.executemany(_INSERT_METADATA_SQL, rows)
+
+                processed += len(chunk)
+                # One progress line per 1000-row batch, %-formatted so the
+                # message is only built when the record is actually emitted
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Processed %d/%d symbols", processed, total)
+
+            cursor.execute("COMMIT")
             logger.info(f"✅ Successfully populated financial data for {processed} symbols")
+
+            # Fold the fresh WAL back into the main file so the stats
+            # scan reads straight from the (mmap-able) database instead
+            # of chasing every page through the WAL index
+            cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
             
-            # Show some statistics
-            cursor.execute("SELECT COUNT(*) FROM symbol_metadata")
-            total_financial = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM symbol_metadata WHERE pe_ratio IS NOT NULL")
-            with_pe = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM symbol_metadata WHERE dividend_yield IS NOT NULL")
-            with_dividend = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT AVG(pe_ratio) FROM symbol_metadata WHERE pe_ratio IS NOT NULL")
-            avg_pe = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT AVG(dividend_yield) FROM symbol_metadata WHERE dividend_yield IS NOT NULL")
-            avg_dividend = cursor.fetchone()[0]
+            # Show some statistics: one table scan computes all five
+            # aggregates (COUNT(col) and AVG already skip NULLs, so the
+            # IS NOT NULL filters are implicit)
+            cursor.execute("""
+                SELECT COUNT(*), COUNT(pe_ratio), COUNT(dividend_yield),
+                       AVG(pe_ratio), AVG(dividend_yield)
+                FROM symbol_metadata
+            """)
+            total_financial, with_pe, with_dividend, avg_pe, avg_dividend = cursor.fetchone()
             
-            logger.info(f"📊 Financial Data Statistics:")
-            logger.info(f"  Total symbols with financial data: {total_financial}")
-            logger.info(f"  Symbols with PE ratio: {with_pe}")
-            logger.info(f"  Symbols with dividend data: {with_dividend}")
-            logger.info(f"  Average PE ratio: {avg_pe:.2f}" if avg_pe else "  Average PE ratio: N/A")
-            logger.info(f"  Average dividend yield: {avg_dividend:.2f}%" if avg_dividend else "  Average dividend yield: N/A")
+            # One multi-line record instead of six handler round-trips
+            logger.info("\n".join([
+                "📊 Financial Data Statistics:",
+                f"  Total symbols with financial data: {total_financial}",
+                f"  Symbols with PE ratio: {with_pe}",
+                f"  Symbols with dividend data: {with_dividend}",
+                f"  Average PE ratio: {avg_pe:.2f}" if avg_pe else "  Average PE ratio: N/A",
+                f"  Average dividend yield: {avg_dividend:.2f}%" if avg_dividend else "  Average dividend yield: N/A",
+            ]))
             
-            conn.close()
             return True
             
         except Exception as e:
             logger.error(f"Error populating financial data: {e}")
+            if conn.in_transaction:
+                cursor.execute("ROLLBACK")
             return False
 
 def main():
     """Main function to populate financial data"""
     try:
-        populator = FinancialDataPopulator()
-        
-        logger.info("🚀 Starting Financial Data Population")
-        logger.info("=" * 60)
-        
-        # Setup database table
-        populator.setup_symbol_metadata_table()
-        
-        # Populate financial data
-        success = populator.populate_financial_data()
+        logger.info("🚀 Starting Financial Data Population\n" + "=" * 60)
+
+        # One populator = one shared SQLite connection for the whole run
+        with FinancialDataPopulator() as populator:
+            # Setup database table (indexes come after the bulk load)
+            populator.setup_symbol_metadata_table()
+
+            # Populate financial data, then build the query indexes over it
+            success = populator.populate_financial_data()
+            if success:
+                populator.create_secondary_indexes()
         
         if success:
             logger.info("✅ Financial data population completed successfully!")
@@ -9,6 +9,14 @@ import sys
 import os
 import logging
 
+# uvloop's C event loop makes the concurrent NSE/BSE fetches noticeably
+# faster; fall back silently where it isn't installed
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
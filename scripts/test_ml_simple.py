@@ -25,7 +25,7 @@ class SimpleMLTester:
             cursor.execute("""
                 SELECT symbol, company_name, exchange, segment, sector, 
                        market_cap, is_fo_enabled, is_etf, is_index
-                FROM stock_symbols 
+                FROM stock_symbols_v 
                 WHERE status = 'ACTIVE'
                 ORDER BY market_cap DESC NULLS LAST
             """)
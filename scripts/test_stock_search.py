@@ -40,7 +40,7 @@ def test_stock_search():
                 SELECT 
                     symbol, company_name, exchange, segment, sector,
                     market_cap, is_fo_enabled, is_etf, is_index
-                FROM stock_symbols 
+                FROM stock_symbols_v 
                 WHERE (symbol LIKE ? OR company_name LIKE ?) 
                   AND status = 'ACTIVE'
                 ORDER BY 
@@ -86,14 +86,14 @@ def test_stock_search():
         
         for segment in segments:
             cursor.execute("""
-                SELECT COUNT(*) FROM stock_symbols 
+                SELECT COUNT(*) FROM stock_symbols_v 
                 WHERE segment = ? AND status = 'ACTIVE'
             """, (segment,))
             count = cursor.fetchone()[0]
             
             cursor.execute("""
                 SELECT symbol, company_name, exchange 
-                FROM stock_symbols 
+                FROM stock_symbols_v 
                 WHERE segment = ? AND status = 'ACTIVE'
                 LIMIT 3
             """, (segment,))
@@ -107,7 +107,7 @@ def test_stock_search():
         logger.info(f"\n🏛️ Exchange distribution:")
         cursor.execute("""
             SELECT exchange, COUNT(*) as count 
-            FROM stock_symbols 
+            FROM stock_symbols_v 
             WHERE status = 'ACTIVE' 
             GROUP BY exchange 
             ORDER BY count DESC